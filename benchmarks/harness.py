@@ -0,0 +1,88 @@
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional
+import json
+import os
+import time
+import tracemalloc
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    run: Callable
+    setup: Optional[Callable] = None
+    group: str = 'model'
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    group: str
+    repeat: int
+    best: float
+    mean: float
+    peak_memory: int
+
+    def describe(self):
+        return (f'{self.name:<48} best {self.best * 1e3:9.3f} ms  '
+                f'mean {self.mean * 1e3:9.3f} ms  peak {self.peak_memory / 2**20:8.2f} MB')
+
+
+def run_case(case, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        state = case.setup() if case.setup else None
+        start = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - start)
+
+    # Peak memory is taken from a separate run because tracemalloc slows down allocation.
+    state = case.setup() if case.setup else None
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        repeat=repeat,
+        best=min(timings),
+        mean=sum(timings) / len(timings),
+        peak_memory=peak
+    )
+
+
+def baseline_path(name):
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save_baseline(results, name):
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({result.name: asdict(result) for result in results}, file, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(name):
+    with open(baseline_path(name)) as file:
+        return {key: BenchmarkResult(**value) for key, value in json.load(file).items()}
+
+
+def compare(results, baseline, threshold=0.1):
+    lines = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            lines.append(f'{result.name:<48} new')
+            continue
+        time_ratio = result.best / reference.best if reference.best else float('inf')
+        memory_ratio = result.peak_memory / reference.peak_memory if reference.peak_memory else 1.0
+        status = ('slower' if time_ratio > 1 + threshold else
+                  'faster' if time_ratio < 1 - threshold else 'same')
+        lines.append(f'{result.name:<48} time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}  {status}')
+    return lines
@@ -0,0 +1,227 @@
+import shutil
+import tempfile
+import numpy as np
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+from model.layout import ElementLayout
+from model.monte_carlo import ErrorModel, MonteCarloAnalysis
+from model.sweep import ParameterSweep, SweepGrid
+from benchmarks.harness import BenchmarkCase
+
+ELEMENT_COUNTS = (16, 64, 256)
+GRID_SIZES = (100, 200, 400)
+ARRAY_TYPES = ('linear', 'curved')
+
+def make_params(elements, array_type, steering=0.3):
+    return BeamformingParameters(
+        elements=elements, spacing=0.5, steering=steering, array_type=array_type,
+        curvature=2.0, frequency=300, phase=0
+    )
+
+
+def _cold_model():
+    model = BeamformingModel()
+    model.clear_caches()
+    return model
+
+
+def _warm_model(params, angles):
+    model = BeamformingModel()
+    model.clear_caches()
+    model.calculate_pattern(params, angles, use_phase=True)
+    return model
+
+
+def pattern_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    cases = []
+    for array_type in ARRAY_TYPES:
+        for elements in ELEMENT_COUNTS:
+            params = make_params(elements, array_type)
+            steered = make_params(elements, array_type, steering=0.4)
+            cases.append(BenchmarkCase(
+                name=f'pattern/{array_type}/{elements}',
+                setup=_cold_model,
+                run=lambda model, params=params: model.calculate_pattern(params, angles, use_phase=True)
+            ))
+            cases.append(BenchmarkCase(
+                name=f'pattern_steering_drag/{array_type}/{elements}',
+                setup=lambda params=params: _warm_model(params, angles),
+                run=lambda model, params=steered: model.calculate_pattern(params, angles, use_phase=True)
+            ))
+            cases.append(BenchmarkCase(
+                name=f'steering_vector/{array_type}/{elements}',
+                setup=_cold_model,
+                run=lambda model, params=params: model.calculate_steering_vector(params, use_phase=True)
+            ))
+    return cases
+
+
+def interference_cases():
+    cases = []
+    for array_type in ARRAY_TYPES:
+        for grid_size in GRID_SIZES:
+            params = [vars(make_params(64, array_type))]
+            cases.append(BenchmarkCase(
+                name=f'interference/{array_type}/{grid_size}',
+                setup=_cold_model,
+                run=lambda model, params=params, grid_size=grid_size:
+                    model.calculate_interference_pattern(params, grid_size)
+            ))
+    return cases
+
+
+def batch_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    cases = []
+    for array_type in ARRAY_TYPES:
+        params_list = [make_params(64, array_type, steering) for steering in np.linspace(-1, 1, 256)]
+        cases.append(BenchmarkCase(
+            name=f'pattern_batch/{array_type}/256x64',
+            setup=_cold_model,
+            run=lambda model, params_list=params_list: model.calculate_pattern_batch(params_list, angles, True)
+        ))
+    return cases
+
+
+def planar_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    cases = []
+    for columns, rows in ((32, 32), (100, 100)):
+        params = BeamformingParameters(
+            elements=columns, rows=rows, spacing=0.5, steering=0.3, array_type='planar',
+            curvature=2.0, frequency=300, phase=0
+        )
+        cases.append(BenchmarkCase(
+            name=f'planar_pattern/{columns}x{rows}',
+            setup=_cold_model,
+            run=lambda model, params=params: model.calculate_pattern(params, angles, use_phase=True)
+        ))
+        cases.append(BenchmarkCase(
+            name=f'planar_interference/{columns}x{rows}',
+            setup=_cold_model,
+            run=lambda model, params=params: model.calculate_interference_pattern([vars(params)])
+        ))
+    return cases
+
+
+def custom_layout_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    rng = np.random.default_rng(0)
+    cases = []
+    for elements in (10_000, 100_000):
+        layout = ElementLayout(x=rng.uniform(-50, 50, elements), y=rng.uniform(-50, 50, elements))
+        params = BeamformingParameters(
+            elements=elements, spacing=0.5, steering=0.3, array_type='custom',
+            curvature=2.0, frequency=300, phase=0, layout=layout
+        )
+        cases.append(BenchmarkCase(
+            name=f'custom_pattern/{elements}',
+            setup=_cold_model,
+            run=lambda model, params=params: model.calculate_pattern(params, angles, use_phase=True)
+        ))
+    return cases
+
+
+def _kernel_model(backend, warm):
+    # Warmed up so the timing and peak memory are those of a steady-state frame: buffers
+    # already sized and, for Numba, the kernels already compiled.
+    model = _cold_model()
+    model.kernel.backend = backend
+    warm(model)
+    return model
+
+
+def kernel_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    params_list = [make_params(64, 'curved', steering) for steering in np.linspace(-1, 1, 256)]
+    units = [{**vars(make_params(32, 'curved', 0.1 * index)), 'x_position': index, 'id': index} for index in range(4)]
+    runs = {
+        'curved_batch/256x64': lambda model: model.calculate_pattern_batch(params_list, angles, False),
+        'adaptive_multi_unit/4': lambda model: model.calculate_adaptive_pattern(units, False)
+    }
+    return [BenchmarkCase(name=f'kernel/{backend}/{name}', run=run,
+                          setup=lambda backend=backend, run=run: _kernel_model(backend, run))
+            for backend in ('numpy', 'auto') for name, run in runs.items()]
+
+
+def metric_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 2001)
+    cases = []
+    for array_type in ARRAY_TYPES:
+        params = [vars(make_params(100, array_type))]
+        params_list = [make_params(64, array_type, steering) for steering in np.linspace(-1, 1, 256)]
+        cases.append(BenchmarkCase(
+            name=f'adaptive_pattern/{array_type}/100',
+            setup=_cold_model,
+            run=lambda model, params=params: model.calculate_adaptive_pattern(params, True)
+        ))
+        cases.append(BenchmarkCase(
+            name=f'beam_metrics_batch/{array_type}/256x64',
+            setup=_cold_model,
+            run=lambda model, params_list=params_list: model.calculate_beam_metrics_batch(params_list, angles, True)
+        ))
+    return cases
+
+
+def monte_carlo_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    params = make_params(100, 'linear')
+    calibration = ErrorModel(failure_rate=0.05, phase_error=5, amplitude_error=0.05)
+    jitter = ErrorModel(failure_rate=0.05, phase_error=5, amplitude_error=0.05, position_error=0.02)
+    return [BenchmarkCase(
+        name=f'monte_carlo/{name}/1000x100',
+        setup=lambda errors=errors: MonteCarloAnalysis(_cold_model(), errors, trials=1000, seed=0),
+        run=lambda analysis: analysis.run(params, angles)
+    ) for name, errors in (('calibration', calibration), ('jitter', jitter))]
+
+
+def _single_precision(model):
+    model.precision = 'single'
+    return model
+
+
+def precision_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    cases = []
+    for array_type in ARRAY_TYPES:
+        params = [vars(make_params(64, array_type))]
+        params_list = [make_params(64, array_type, steering) for steering in np.linspace(-1, 1, 256)]
+        cases.append(BenchmarkCase(
+            name=f'interference_single/{array_type}/400',
+            setup=lambda: _single_precision(_cold_model()),
+            run=lambda model, params=params: model.calculate_interference_pattern(params, 400)
+        ))
+        cases.append(BenchmarkCase(
+            name=f'pattern_batch_single/{array_type}/256x64',
+            setup=lambda: _single_precision(_cold_model()),
+            run=lambda model, params_list=params_list: model.calculate_pattern_batch(params_list, angles, True)
+        ))
+    return cases
+
+
+def _sweep_setup(grid, angles):
+    directory = tempfile.mkdtemp(prefix='sweep-')
+    return ParameterSweep(_cold_model(), grid, angles, directory), directory
+
+
+def _run_sweep(state):
+    sweep, directory = state
+    try:
+        sweep.run()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def sweep_cases():
+    angles = np.linspace(-np.pi/2, np.pi/2, 1000)
+    grid = SweepGrid(steering=np.linspace(-60, 60, 64), frequency=[150, 300, 600, 900],
+                     elements=[16, 64], spacing=[0.25, 0.5])
+    return [BenchmarkCase(
+        name='sweep/linear/1024',
+        setup=lambda: _sweep_setup(grid, angles),
+        run=_run_sweep
+    )]
+
+
+def collect():
+    return pattern_cases() + interference_cases() + batch_cases() + planar_cases() + custom_layout_cases() + kernel_cases() + metric_cases() + monte_carlo_cases() + precision_cases() + sweep_cases()
@@ -0,0 +1,85 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from controller.visualization_controller import VisualizationController
+from benchmarks.harness import BenchmarkCase
+
+SCENARIOS = {
+    'linear16': dict(elements=16, spacing=0.5, steering=20, array_type='linear', curvature=1.0,
+                     frequency=300, phase=0, x_position=0, y_position=0),
+    'curved64': dict(elements=64, spacing=0.5, steering=-30, array_type='curved', curvature=2.0,
+                     frequency=300, phase=0, x_position=0, y_position=0)
+}
+
+def _make_axes(is_polar=False):
+    figure = Figure(figsize=(6, 3), facecolor='#111827')
+    FigureCanvasAgg(figure)
+    return figure.add_subplot(111, projection='polar' if is_polar else None)
+
+
+def _setup(params_list, is_polar=False, incremental=False, update=None):
+    def setup():
+        controller = VisualizationController()
+        frame = controller.compute_frame(params_list)
+        ax = _make_axes(is_polar)
+        if incremental:
+            update(controller, ax, params_list, frame)
+            ax.figure.canvas.draw()
+        return controller, ax, frame
+    return setup
+
+
+def _draw(plot):
+    def run(state):
+        controller, ax, frame = state
+        plot(controller, ax, frame.params_list, frame)
+        ax.figure.canvas.draw()
+    return run
+
+
+def _blit(update):
+    def run(state):
+        controller, ax, frame = state
+        update(controller, ax, frame.params_list, frame)
+        canvas = ax.figure.canvas
+        background = canvas.copy_from_bbox(ax.figure.bbox)
+        canvas.restore_region(background)
+        for artist in ax.get_children():
+            if artist.get_animated():
+                ax.draw_artist(artist)
+        canvas.blit(ax.figure.bbox)
+    return run
+
+
+PLOTS = {
+    'rectangular_beam': (False,
+                         lambda c, ax, p, f: c.beam_visualizer.plot_rectangular_beam(ax, p, f.beam),
+                         lambda c, ax, p, f: c.beam_visualizer.update_rectangular_beam(ax, p, f.beam)),
+    'polar_beam': (True,
+                   lambda c, ax, p, f: c.beam_visualizer.plot_polar_beam(ax, p, f.beam),
+                   lambda c, ax, p, f: c.beam_visualizer.update_polar_beam(ax, p, f.beam)),
+    'array_geometry': (False,
+                       lambda c, ax, p, f: c.array_visualizer.plot_array_geometry(ax, p, f.geometry),
+                       lambda c, ax, p, f: c.array_visualizer.update_array_geometry(ax, p, f.geometry)),
+    'interference': (False,
+                     lambda c, ax, p, f: c.interference_visualizer.plot_interference(ax, p, f.interference),
+                     lambda c, ax, p, f: c.interference_visualizer.update_interference(ax, p, f.interference))
+}
+
+def collect():
+    cases = []
+    for scenario, params in SCENARIOS.items():
+        params_list = [params]
+        for plot_name, (is_polar, plot, update) in PLOTS.items():
+            cases.append(BenchmarkCase(
+                name=f'render/{plot_name}/{scenario}',
+                group='render',
+                setup=_setup(params_list, is_polar),
+                run=_draw(plot)
+            ))
+            cases.append(BenchmarkCase(
+                name=f'render_incremental/{plot_name}/{scenario}',
+                group='render',
+                setup=_setup(params_list, is_polar, incremental=True, update=update),
+                run=_blit(update)
+            ))
+    return cases
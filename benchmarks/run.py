@@ -0,0 +1,58 @@
+import argparse
+import fnmatch
+import os
+import sys
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import harness, model_benchmarks, render_benchmarks, startup_benchmarks
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the Beamforming-Simulator benchmarks headless.')
+    parser.add_argument('-k', '--filter', default='*', help='glob matched against benchmark names')
+    parser.add_argument('--group', choices=['model', 'render', 'startup', 'all'], default='all')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save-baseline', metavar='NAME', help='store results under benchmarks/baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='compare against a stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative change reported as slower/faster')
+    parser.add_argument('--list', action='store_true', help='list benchmark names and exit')
+    return parser.parse_args(argv)
+
+
+def collect_cases(group, pattern):
+    cases = []
+    if group in ('model', 'all'):
+        cases += model_benchmarks.collect()
+    if group in ('render', 'all'):
+        cases += render_benchmarks.collect()
+    if group in ('startup', 'all'):
+        cases += startup_benchmarks.collect()
+    return [case for case in cases if fnmatch.fnmatch(case.name, pattern)]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = collect_cases(args.group, args.filter)
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+
+    results = []
+    for case in cases:
+        result = harness.run_case(case, args.repeat)
+        results.append(result)
+        print(result.describe(), flush=True)
+
+    if args.save_baseline:
+        print(f'baseline written to {harness.save_baseline(results, args.save_baseline)}')
+    if args.compare:
+        print()
+        for line in harness.compare(results, harness.load_baseline(args.compare), args.threshold):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
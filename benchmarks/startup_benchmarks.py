@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from benchmarks.harness import BenchmarkCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = {
+    'model': 'import model.beamforming_model',
+    'controller': 'import controller.visualization_controller',
+    'view': 'import view.main_window'
+}
+
+HEADLESS_WORKER = """
+import tempfile
+from headless import Scenario, render_scenario
+from model.presets import PRESETS
+render_scenario(Scenario.from_config('5G', PRESETS['5G Communications']), tempfile.mkdtemp(), ['npz'])
+"""
+
+GUI_FIRST_FRAME = """
+import sys, time
+from PyQt5.QtWidgets import QApplication
+from view.main_window import BeamformingSimulator
+app = QApplication(sys.argv)
+window = BeamformingSimulator()
+window.show()
+while window.render_scheduler.is_busy():
+    app.processEvents()
+    time.sleep(0.001)
+app.processEvents()
+"""
+
+def _run_python(source, environment=None):
+    # Every run is a fresh interpreter, so the timing is a cold start including interpreter
+    # start-up; the 'none' case gives that floor.
+    def run(state):
+        subprocess.run([sys.executable, '-c', source], cwd=ROOT, check=True,
+                       env={**os.environ, 'PYTHONPATH': ROOT, **(environment or {})},
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return run
+
+
+def collect():
+    cases = [BenchmarkCase(name='startup/import/none', group='startup', run=_run_python('pass'))]
+    cases += [BenchmarkCase(name=f'startup/import/{name}', group='startup', run=_run_python(source))
+              for name, source in IMPORTS.items()]
+    cases.append(BenchmarkCase(name='startup/headless_worker', group='startup',
+                               run=_run_python(HEADLESS_WORKER, {'MPLBACKEND': 'Agg'})))
+    cases.append(BenchmarkCase(name='startup/gui_first_frame', group='startup',
+                               run=_run_python(GUI_FIRST_FRAME, {'QT_QPA_PLATFORM': 'offscreen'})))
+    return cases
@@ -1,12 +1,16 @@
 from .base_controller import BaseController
 import numpy as np
-import matplotlib.pyplot as plt
 from model.array_model import ArrayModel
+from model.profiling import profiled
+
+# Scatter points drawn per array; larger layouts are decimated for display only.
+_MAX_SCATTER_POINTS = 5000
 
 class ArrayGeometryController(BaseController):
     def __init__(self):
         super().__init__()
         self.array_model = ArrayModel()
+        self._scatters = {}
         
     def _style_plot_axes(self, ax, limit_x, limit_y):
         ax.set_aspect('equal')
@@ -25,35 +29,85 @@ class ArrayGeometryController(BaseController):
         ax.set_ylim(-limit_y, limit_y)
         
     def _calculate_plot_limits(self, x_positions, y_positions):
-        max_abs_x = max(abs(min(x_positions)), abs(max(x_positions)))
-        max_abs_y = max(abs(min(y_positions)), abs(max(y_positions)))
+        max_abs_x = np.max(np.abs(x_positions))
+        max_abs_y = np.max(np.abs(y_positions))
         padding = 2
         return (int(np.ceil(max_abs_x + padding)), 
                 int(np.ceil(max_abs_y + padding)))
     
     def _plot_array_scatter(self, ax, positions, array_id, colors):
         color_index = (array_id - 1) % 10
-        ax.scatter(positions.x, positions.y,
+        x, y = self._display_points(positions)
+        ax.scatter(x, y,
                   color=colors[color_index],
+                  s=self._marker_size(x.size),
                   label=f'Array {array_id}')
+
+    def _display_points(self, positions):
+        # An even stride keeps the outline and density of the layout with a bounded artist size.
+        stride = max(1, -(-positions.x.size // _MAX_SCATTER_POINTS))
+        return positions.x[::stride], positions.y[::stride]
+
+    def _marker_size(self, element_count):
+        # Shrink markers on large panels so thousands of elements stay distinguishable.
+        return float(np.clip(9216 / max(element_count, 1), 1, 36))
     
-    def plot_array_geometry(self, ax, params_list):
+    @profiled('controller.geometry')
+    def calculate_geometry(self, params_list):
+        return [(params.get("id", 1), self.array_model.calculate_positions(params))
+                for params in params_list]
+
+    @profiled('render.artists.array_geometry')
+    def plot_array_geometry(self, ax, params_list, geometry=None):
         ax.clear()
         if not params_list:
             return
             
-        colors = plt.cm.tab10(np.linspace(0, 1, 10))
-        x_positions = []
-        y_positions = []
-        
-        for params in params_list:
-            positions = self.array_model.calculate_positions(params)
-            x_positions.extend(positions.x)
-            y_positions.extend(positions.y)
-            
-            array_id = params.get("id", 1)
+        # matplotlib is imported only for drawing, so workers that only compute frames never load it.
+        from matplotlib import colormaps
+
+        if geometry is None:
+            geometry = self.calculate_geometry(params_list)
+        colors = colormaps['tab10'](np.linspace(0, 1, 10))
+        for array_id, positions in geometry:
             self._plot_array_scatter(ax, positions, array_id, colors)
         
+        x_positions = np.concatenate([positions.x for _, positions in geometry])
+        y_positions = np.concatenate([positions.y for _, positions in geometry])
         limit_x, limit_y = self._calculate_plot_limits(x_positions, y_positions)
         self._style_plot_axes(ax, limit_x, limit_y)
-        ax.legend(labelcolor='#1E293B', bbox_to_anchor=(1, 1.07), loc='upper right', fontsize=8)
\ No newline at end of file
+        ax.legend(labelcolor='#1E293B', bbox_to_anchor=(1, 1.07), loc='upper right', fontsize=8)
+
+    @profiled('render.artists.array_geometry')
+    def update_array_geometry(self, ax, params_list, geometry=None):
+        if geometry is None:
+            geometry = self.calculate_geometry(params_list)
+        layout = self._geometry_layout(geometry)
+        state = self._scatters.get(ax)
+
+        if state is not None and state['layout'] == layout and all(
+                scatter in ax.collections for scatter in state['scatters']):
+            for scatter, (_, positions) in zip(state['scatters'], geometry):
+                x, y = self._display_points(positions)
+                scatter.set_offsets(np.column_stack((x, y)))
+                scatter.set_sizes([self._marker_size(x.size)])
+            return False
+
+        self.plot_array_geometry(ax, params_list, geometry)
+        scatters = list(ax.collections)
+        for scatter in scatters:
+            scatter.set_animated(True)
+        self._scatters[ax] = {'layout': layout, 'scatters': scatters}
+        return True
+
+    def _geometry_layout(self, geometry):
+        # Array ids drive the legend and the limits drive the ticks; either changing
+        # means the static background has to be redrawn.
+        if not geometry:
+            return ()
+        x_positions = np.concatenate([positions.x for _, positions in geometry])
+        y_positions = np.concatenate([positions.y for _, positions in geometry])
+        if x_positions.size == 0:
+            return tuple(array_id for array_id, _ in geometry), None
+        limits = self._calculate_plot_limits(x_positions, y_positions)
+        return tuple(array_id for array_id, _ in geometry), limits
\ No newline at end of file
@@ -1,30 +1,33 @@
 from .base_controller import BaseController
 import numpy as np
-from model.beamforming_model import BeamformingModel, BeamformingParameters
+from model.beamforming_model import BeamformingModel
+from model.profiling import profiled
 
 class BeamPatternController(BaseController):
-    def __init__(self):
+    def __init__(self, model=None):
         super().__init__()
-        self.model = BeamformingModel()
+        self.model = model or BeamformingModel()
+        self._lines = {}
         
     def _setup_beam_plot(self, params_list):
-        steering_angles = np.linspace(-np.pi/2, np.pi/2, 1000)
         converted_params = self._convert_steering_angles(params_list)
-        params = BeamformingParameters(**converted_params[0])
-        return steering_angles, self.model.calculate_pattern(
-            params, 
-            steering_angles, 
-            use_phase=True
-        )
+        return self.model.calculate_adaptive_pattern(converted_params, use_phase=True)
     
+    @profiled('controller.beam_pattern')
+    def calculate_beam_pattern(self, params_list):
+        return self._setup_beam_plot(params_list)
+
     def _style_plot_axes(self, ax, title, is_polar=False):
         ax.grid(True, color="gray")
         ax.tick_params(colors='white')
         ax.set_title(title, color='white', pad=23 if not is_polar else 10)
         
-    def plot_rectangular_beam(self, ax, params_list):
+    @profiled('render.artists.rectangular_beam')
+    def plot_rectangular_beam(self, ax, params_list, beam_pattern=None):
         ax.clear()
-        steering_angles, beam_pattern = self._setup_beam_plot(params_list)
+        if beam_pattern is None:
+            beam_pattern = self._setup_beam_plot(params_list)
+        steering_angles, beam_pattern = beam_pattern
         
         ax.set_xlim(-10, 10)
         ax.plot(steering_angles*180/np.pi, beam_pattern)
@@ -33,9 +36,12 @@ class BeamPatternController(BaseController):
         ax.set_xticks(np.arange(-90, 91, 20))
         self._style_plot_axes(ax, 'Rectangular Beam Pattern')
         
-    def plot_polar_beam(self, ax, params_list):
+    @profiled('render.artists.polar_beam')
+    def plot_polar_beam(self, ax, params_list, beam_pattern=None):
         ax.clear()
-        steering_angles, beam_pattern = self._setup_beam_plot(params_list)
+        if beam_pattern is None:
+            beam_pattern = self._setup_beam_plot(params_list)
+        steering_angles, beam_pattern = beam_pattern
         
         if hasattr(ax, 'set_theta_zero_location'):
             self._configure_polar_axes(ax)
@@ -43,6 +49,44 @@ class BeamPatternController(BaseController):
         ax.plot(steering_angles, beam_pattern)
         self._style_plot_axes(ax, 'Polar Beam Pattern', is_polar=True)
         
+    @profiled('render.artists.rectangular_beam')
+    def update_rectangular_beam(self, ax, params_list, beam_pattern=None):
+        if beam_pattern is None:
+            beam_pattern = self._setup_beam_plot(params_list)
+        steering_angles, pattern = beam_pattern
+        if self._update_line(ax, steering_angles*180/np.pi, pattern):
+            return False
+
+        self.plot_rectangular_beam(ax, params_list, beam_pattern)
+        # Fixed limits stand in for autoscaling so later frames never move the axes.
+        ax.set_ylim(self.model.magnitude_min - 3, self.model.magnitude_max + 3)
+        self._track_line(ax)
+        return True
+
+    @profiled('render.artists.polar_beam')
+    def update_polar_beam(self, ax, params_list, beam_pattern=None):
+        if beam_pattern is None:
+            beam_pattern = self._setup_beam_plot(params_list)
+        steering_angles, pattern = beam_pattern
+        if self._update_line(ax, steering_angles, pattern):
+            return False
+
+        self.plot_polar_beam(ax, params_list, beam_pattern)
+        self._track_line(ax)
+        return True
+
+    def _update_line(self, ax, x, y):
+        line = self._lines.get(ax)
+        if line is None or line not in ax.lines:
+            return False
+        line.set_data(x, y)
+        return True
+
+    def _track_line(self, ax):
+        line = ax.lines[-1]
+        line.set_animated(True)
+        self._lines[ax] = line
+
     def _configure_polar_axes(self, ax):
         ax.set_theta_zero_location('N')
         ax.set_theta_direction(-1)
@@ -1,16 +1,19 @@
 from .base_controller import BaseController
 import numpy as np
-import matplotlib.pyplot as plt
-from model.beamforming_model import BeamformingModel
-from controller.beam_pattern_controller import BeamPatternController
+from model.array_model import ArrayModel
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+from model.profiling import profiled
 
 class InterferenceController(BaseController):
-    def __init__(self):
+    def __init__(self, model=None):
         super().__init__()
         self.magnitude_min = -60
         self.magnitude_max = 0
-        self.model = BeamformingModel()
-        self.polar = BeamPatternController()
+        self.interference_mode = 'auto'
+        self.field_solver_limit = 2**24
+        self._images = {}
+        self._lut = None
+        self.model = model or BeamformingModel()
 
     def _create_colorbar(self, fig, ax, im):
         cax = fig.add_axes([0.92, 0.1, 0.03, 0.8])
@@ -28,9 +31,12 @@ class InterferenceController(BaseController):
         cbar.set_label('dB', color='white', rotation=0, labelpad=-5, y=1.08)
 
     def _setup_interference_plot(self, ax, masked_pattern):
-        circle = plt.Circle((0, 0), 10, transform=ax.transData)
+        from matplotlib.patches import Circle
+
+        extent = self.model.grid_extent
+        circle = Circle((0, 0), extent, transform=ax.transData)
         im = ax.imshow(masked_pattern, 
-                    extent=[-10, 10, -10, 10], 
+                    extent=[-extent, extent, -extent, extent], 
                     cmap='coolwarm',
                     vmin=self.magnitude_min,
                     vmax=self.magnitude_max,  # Set to 0 to match pattern scaling
@@ -42,21 +48,29 @@ class InterferenceController(BaseController):
         ax.text(8, -9.7, 'Destructive\nInterference', color='white', fontsize=8)
 
     def _clear_existing_colorbars(self, fig, ax):
+        from matplotlib.axes import Axes
+
         for cbar in fig.get_axes():
-            if cbar is not ax and isinstance(cbar, plt.Axes):
+            if cbar is not ax and isinstance(cbar, Axes):
                 if cbar.get_label() == 'colorbar':
                     cbar.remove()
 
-    def plot_interference(self, ax, params_list):
+    @profiled('controller.interference')
+    def calculate_interference(self, params_list, resolution=None, cancelled=None):
+        converted_params = self._convert_steering_angles(params_list)
+        interference_pattern = self._calculate_interference_pattern(converted_params, resolution, cancelled)
+        masked_pattern = np.rot90(interference_pattern)
+        return self._apply_circular_mask(masked_pattern)
+
+    @profiled('render.artists.interference')
+    def plot_interference(self, ax, params_list, masked_pattern=None):
         ax.clear()
         fig = ax.figure
         
         self._clear_existing_colorbars(fig, ax)
         
-        converted_params = self._convert_steering_angles(params_list)
-        interference_pattern = self.model.calculate_interference_pattern(converted_params)
-        masked_pattern = np.rot90(interference_pattern)
-        masked_pattern = self._apply_circular_mask(masked_pattern)
+        if masked_pattern is None:
+            masked_pattern = self.calculate_interference(params_list)
         im = self._setup_interference_plot(ax, masked_pattern)
         self._create_colorbar(fig, ax, im)
         
@@ -68,12 +82,66 @@ class InterferenceController(BaseController):
         ax.set_xticks([])
         ax.set_yticks([])
         
+    @profiled('render.artists.interference')
+    def update_interference(self, ax, params_list, masked_pattern=None):
+        if masked_pattern is None:
+            masked_pattern = self.calculate_interference(params_list)
+        image = self._images.get(ax)
+        # The extent is fixed, so a coarse preview and the refined map can share one image.
+        if image is not None and image in ax.images:
+            image.set_data(masked_pattern)
+            return False
+
+        self.plot_interference(ax, params_list, masked_pattern)
+        image = ax.images[-1]
+        image.set_animated(True)
+        self._images[ax] = image
+        return True
+
+    def heatmap_lut(self):
+        # 256 colormap entries as RGBA bytes plus a transparent entry for masked pixels.
+        if self._lut is None:
+            from matplotlib import colormaps
+
+            colors = colormaps['coolwarm'](np.linspace(0, 1, 256), bytes=True)
+            self._lut = np.concatenate([colors, np.zeros((1, 4), dtype=np.uint8)])
+        return self._lut
+
+    @profiled('render.artists.interference_rgba')
+    def heatmap_rgba(self, masked_pattern, out=None):
+        # Same binning as imshow with vmin/vmax: level = (dB - min) / (max - min) * 256, clipped to the table.
+        lut = self.heatmap_lut()
+        colors = lut.shape[0] - 1
+        level = np.ma.getdata(masked_pattern) - np.float32(self.magnitude_min)
+        level *= np.float32(colors / (self.magnitude_max - self.magnitude_min))
+        np.nan_to_num(level, copy=False)
+        np.clip(level, 0, colors - 1, out=level)
+        index = level.astype(np.intp)
+        index[np.ma.getmaskarray(masked_pattern)] = colors
+        if out is None or out.shape != index.shape + (4,):
+            out = np.empty(index.shape + (4,), dtype=np.uint8)
+        # One 32-bit gather per pixel instead of four byte gathers.
+        np.take(lut.view(np.uint32).reshape(-1), index, out=out.view(np.uint32).reshape(index.shape))
+        return out
+
+    def _calculate_interference_pattern(self, params_list, resolution=None, cancelled=None):
+        # The method is chosen for the full-resolution map so a coarse preview matches the refined one.
+        if self._use_field_solver(params_list):
+            return self.model.calculate_field_pattern(params_list, resolution, cancelled)
+        return self.model.calculate_interference_pattern(params_list, resolution, cancelled)
+
+    def _use_field_solver(self, params_list):
+        if self.interference_mode != 'auto':
+            return self.interference_mode == 'near_field'
+        if len(params_list) < 2:
+            return False
+        # The near-field sum costs one exponential per element and pixel; past the limit
+        # (large planar panels) the far-field coherent sum keeps the map interactive.
+        sources = sum(ArrayModel.element_count(BeamformingParameters.from_dict(params)) for params in params_list)
+        return sources * self.model.grid_resolution**2 <= self.field_solver_limit
+
+    @profiled('controller.mask')
     def _apply_circular_mask(self, pattern):
-        ny, nx = pattern.shape
-        y, x = np.ogrid[-ny//2:ny//2, -nx//2:nx//2]
-        
-        circle = x*x + y*y <= (min(nx, ny)//2)**2
-        top_half = y <= 0
-        mask = circle & top_half
-        
-        return np.ma.array(pattern, mask=~mask)
\ No newline at end of file
+        # The model evaluates only these pixels; everything else is filler and stays masked.
+        mask = np.rot90(self.model.visible_mask(pattern.shape[0]))
+        return np.ma.array(pattern, mask=~mask)
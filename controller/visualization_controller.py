@@ -1,19 +1,64 @@
+from dataclasses import dataclass, replace
+import numpy as np
+from model.beamforming_model import BeamformingModel
+from model.profiling import profiled
 from .beam_pattern_controller import BeamPatternController
 from .array_geometry_controller import ArrayGeometryController
 from .interference_controller import InterferenceController
 
+@dataclass
+class FrameResult:
+    index: int
+    params_list: list
+    beam: tuple
+    geometry: list
+    interference: np.ndarray
+    resolution: int = None
+
 class VisualizationController:
     def __init__(self):
-        self.beam_visualizer = BeamPatternController()
+        self.model = BeamformingModel()
+        self.beam_visualizer = BeamPatternController(self.model)
         self.array_visualizer = ArrayGeometryController()
-        self.interference_visualizer = InterferenceController()
+        self.interference_visualizer = InterferenceController(self.model)
+        self.frame_count = 0
+        self.preview_resolution = 50
         self.beam_ax = None
         self.top_xy_ax = None 
         self.interference_ax = None
         self.bottom_xy_ax = None
+
+    @profiled('frame.compute')
+    def compute_frame(self, params_list, resolution=None):
+        self.frame_count += 1
+        resolution = resolution or self.model.grid_resolution
+        return FrameResult(
+            index=self.frame_count,
+            params_list=params_list,
+            beam=self.beam_visualizer.calculate_beam_pattern(params_list),
+            geometry=self.array_visualizer.calculate_geometry(params_list),
+            interference=self.interference_visualizer.calculate_interference(params_list, resolution),
+            resolution=resolution
+        )
+
+    def compute_preview(self, params_list):
+        # Beam and geometry are cheap and exact; only the interference map starts coarse.
+        return self.compute_frame(params_list, min(self.preview_resolution, self.model.grid_resolution))
+
+    @profiled('frame.refine')
+    def refine_frame(self, frame, cancelled=None):
+        if frame.resolution >= self.model.grid_resolution:
+            return None
+        self.frame_count += 1
+        interference = self.interference_visualizer.calculate_interference(
+            frame.params_list, self.model.grid_resolution, cancelled
+        )
+        return replace(frame, index=self.frame_count, interference=interference, resolution=self.model.grid_resolution)
         
-    def update_plots(self, params_list):
-        self.beam_visualizer.plot_rectangular_beam(self.beam_ax, params_list)
-        self.array_visualizer.plot_array_geometry(self.top_xy_ax, params_list)
-        self.interference_visualizer.plot_interference(self.interference_ax, params_list)
-        self.beam_visualizer.plot_polar_beam(self.bottom_xy_ax, params_list)
\ No newline at end of file
+    def update_plots(self, params_list, frame=None):
+        if frame is None:
+            frame = self.compute_frame(params_list)
+        self.beam_visualizer.plot_rectangular_beam(self.beam_ax, params_list, frame.beam)
+        self.array_visualizer.plot_array_geometry(self.top_xy_ax, params_list, frame.geometry)
+        self.interference_visualizer.plot_interference(self.interference_ax, params_list, frame.interference)
+        self.beam_visualizer.plot_polar_beam(self.bottom_xy_ax, params_list, frame.beam)
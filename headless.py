@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from model.presets import PRESETS
+
+DEFAULT_UNIT = {
+    'elements': 16,
+    'spacing': 0.5,
+    'steering': 0.0,
+    'curvature': 1.0,
+    'frequency': 300.0,
+    'x_position': 0.0,
+    'y_position': 0.0,
+    'array_type': 'linear',
+    'phase': 0,
+    'rows': 1
+}
+
+@dataclass
+class Scenario:
+    name: str
+    units: list
+
+    @classmethod
+    def from_config(cls, name, config, directory=''):
+        units = config.get('units', [config]) if isinstance(config, dict) else config
+        return cls(name=config.get('name', name) if isinstance(config, dict) else name,
+                   units=[cls._normalize_unit(unit, index, directory) for index, unit in enumerate(units, start=1)])
+
+    @staticmethod
+    def _normalize_unit(unit, index, directory=''):
+        # A unit with a layout file is a custom array; relative paths are resolved against the scenario file.
+        if unit.get('layout'):
+            unit = {'array_type': 'custom', **unit, 'layout': os.path.join(directory, unit['layout'])}
+        unit = {**DEFAULT_UNIT, 'id': index, **unit}
+        unit['array_type'] = unit['array_type'].lower()
+        return unit
+
+    @property
+    def slug(self):
+        return re.sub(r'[^A-Za-z0-9]+', '_', self.name).strip('_').lower() or 'scenario'
+
+
+def load_scenarios(sources):
+    scenarios = []
+    for source in sources:
+        if source in PRESETS:
+            scenarios.append(Scenario.from_config(source, PRESETS[source]))
+            continue
+        with open(source) as file:
+            config = json.load(file)
+        name = os.path.splitext(os.path.basename(source))[0]
+        directory = os.path.dirname(source)
+        if isinstance(config, dict) and 'scenarios' in config:
+            scenarios.extend(Scenario.from_config(f'{name}_{index}', item, directory)
+                             for index, item in enumerate(config['scenarios'], start=1))
+        else:
+            scenarios.append(Scenario.from_config(name, config, directory))
+    return scenarios
+
+
+def render_scenario(scenario, output_dir, formats, resolution=None, precision='double'):
+    from controller.visualization_controller import VisualizationController
+
+    controller = VisualizationController()
+    if resolution:
+        controller.model.grid_resolution = resolution
+    controller.model.precision = precision
+    frame = controller.compute_frame(scenario.units)
+
+    written = []
+    base = os.path.join(output_dir, scenario.slug)
+    if 'npz' in formats:
+        written.append(_write_npz(f'{base}.npz', frame))
+    if 'png' in formats:
+        written.append(_write_png(f'{base}.png', controller, frame, scenario.name))
+    return scenario.name, written
+
+
+def _write_npz(path, frame):
+    import numpy as np
+
+    angles, pattern = frame.beam
+    interference = np.ma.filled(frame.interference.astype(float), np.nan)
+    positions = {}
+    for array_id, unit_positions in frame.geometry:
+        positions[f'positions_x_{array_id}'] = unit_positions.x
+        positions[f'positions_y_{array_id}'] = unit_positions.y
+    np.savez_compressed(path, beam_angles=angles, beam_pattern=pattern,
+                        interference=interference, **positions)
+    return path
+
+
+def _write_png(path, controller, frame, title):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(13, 7), facecolor='#111827')
+    FigureCanvasAgg(figure)
+    panels = figure.subfigures(2, 2)
+    axes = {
+        'beam': panels[0, 0].add_subplot(111),
+        'polar': panels[0, 1].add_subplot(111, projection='polar'),
+        'array': panels[1, 0].add_subplot(111),
+        'interference': panels[1, 1].add_subplot(111)
+    }
+    for panel in panels.flat:
+        panel.set_facecolor('#111827')
+    for ax in axes.values():
+        ax.set_facecolor('#111827')
+
+    params_list = frame.params_list
+    controller.beam_visualizer.plot_rectangular_beam(axes['beam'], params_list, frame.beam)
+    controller.beam_visualizer.plot_polar_beam(axes['polar'], params_list, frame.beam)
+    controller.array_visualizer.plot_array_geometry(axes['array'], params_list, frame.geometry)
+    controller.interference_visualizer.plot_interference(axes['interference'], params_list, frame.interference)
+    panels[0, 0].subplots_adjust(left=0.17, right=0.95, top=0.85, bottom=0.15)
+    panels[1, 0].subplots_adjust(left=0.19, right=0.95, top=0.9, bottom=0.15)
+    panels[1, 1].subplots_adjust(left=0.05, right=0.88, top=0.86, bottom=0.05)
+    figure.suptitle(title, color='white')
+    figure.savefig(path, facecolor=figure.get_facecolor())
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Render beamforming scenarios without a display.',
+        epilog=f'Presets: {", ".join(PRESETS)}'
+    )
+    parser.add_argument('scenarios', nargs='+', help='preset name or path to a JSON scenario file')
+    parser.add_argument('-o', '--output', default='output', help='output directory')
+    parser.add_argument('-f', '--format', nargs='+', choices=['png', 'npz'], default=['png', 'npz'])
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--resolution', type=int, default=None, help='interference grid resolution')
+    parser.add_argument('--precision', choices=['double', 'single'], default='double')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = load_scenarios(args.scenarios)
+    os.makedirs(args.output, exist_ok=True)
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(render_scenario, scenario, args.output, args.format,
+                                   args.resolution, args.precision): scenario
+                   for scenario in scenarios}
+        for future in as_completed(futures):
+            try:
+                name, written = future.result()
+            except Exception as error:
+                failures += 1
+                print(f'{futures[future].name}: failed: {error}', file=sys.stderr)
+                continue
+            print(f'{name}: {", ".join(written)}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
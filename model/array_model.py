@@ -1,5 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+import os
 import numpy as np
+from model.cache import LRUCache
+from model.layout import ElementLayout
+from model.profiling import profiled
 
 @dataclass
 class ArrayParameters:
@@ -12,6 +16,13 @@ class ArrayParameters:
     x_position: float
     y_position: float
     curvature: float
+    rows: int = 1
+    layout: object = None
+
+    @classmethod
+    def from_dict(cls, params):
+        names = {field.name for field in fields(cls)}
+        return cls(**{name: value for name, value in params.items() if name in names})
 
 @dataclass
 class ArrayPositions:
@@ -22,18 +33,85 @@ class ArrayPositions:
         self.x = np.nan_to_num(self.x, nan=0.0, posinf=0.0, neginf=0.0)
         self.y = np.nan_to_num(self.y, nan=0.0, posinf=0.0, neginf=0.0)
 
+@dataclass
+class BatchPositions:
+    x: np.ndarray
+    y: np.ndarray
+    mask: np.ndarray
+
+    def __post_init__(self):
+        self.x = np.where(self.mask, np.nan_to_num(self.x, nan=0.0, posinf=0.0, neginf=0.0), 0.0)
+        self.y = np.where(self.mask, np.nan_to_num(self.y, nan=0.0, posinf=0.0, neginf=0.0), 0.0)
+
 class ArrayModel:
+    _position_cache = LRUCache(maxsize=64)
+    _layout_cache = LRUCache(maxsize=8)
+
     def __init__(self):
         self._params = None
     
     @classmethod
     def _process_parameters(cls, params):
-        return ArrayParameters(**params) if isinstance(params, dict) else params
+        return ArrayParameters.from_dict(params) if isinstance(params, dict) else params
+
+    @classmethod
+    def cache_info(cls):
+        return cls._position_cache.info()
+
+    @classmethod
+    def load_layout(cls, layout):
+        # Layout files are loaded once per path and modification time; .npy files stay memory-mapped.
+        if layout is None or isinstance(layout, ElementLayout):
+            return layout
+        stat = os.stat(layout)
+        key = (os.path.abspath(layout), stat.st_mtime_ns, stat.st_size)
+        return cls._layout_cache.get_or_compute(key, lambda: ElementLayout.load(layout))
+
+    @staticmethod
+    def geometry_key(params):
+        if params.array_type == 'custom':
+            return ('custom',) + ArrayModel.load_layout(params.layout).key
+        if params.array_type == 'linear':
+            return ('linear', int(params.elements), float(params.spacing))
+        if params.array_type == 'planar':
+            return ('planar', int(params.elements), int(params.rows), float(params.spacing))
+        return ('curved', int(params.elements), float(params.curvature))
+
+    @staticmethod
+    def element_count(params):
+        if params.array_type == 'custom':
+            return len(ArrayModel.load_layout(params.layout))
+        if params.array_type == 'planar':
+            return int(params.elements) * int(params.rows)
+        return int(params.elements)
     
+    @profiled('model.positions')
     def calculate_positions(self, params):
         self._params = self._process_parameters(params)
-        return self._calculate_array_positions()
+        key = self.geometry_key(self._params) + (self._params.x_position, self._params.y_position)
+        return self._position_cache.get_or_compute(key, self._calculate_array_positions)
     
+    @profiled('model.positions')
+    def calculate_batch_positions(self, elements, spacing, curvature, is_linear, rows=None):
+        # Linear rows with rows > 1 are planar grids: element i sits in column i % elements
+        # and row i // elements, so a single row is exactly the linear array.
+        elements = np.asarray(elements, dtype=int).reshape(-1)
+        rows = np.ones_like(elements) if rows is None else np.asarray(rows, dtype=int).reshape(-1)
+        totals = elements * rows
+        index = np.arange(max(int(totals.max(initial=0)), 0))
+        mask = index < totals[:, None]
+        is_linear = np.asarray(is_linear, dtype=bool).reshape(-1, 1)
+        columns = np.maximum(elements, 1).reshape(-1, 1)
+        spacing = np.asarray(spacing, dtype=float).reshape(-1, 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance, scale_factor = self._calculate_curved_params(elements, np.asarray(curvature, dtype=float))
+            radius = (distance * scale_factor).reshape(-1, 1)
+            angles = 2*np.pi / elements.reshape(-1, 1) * index
+            x = np.where(is_linear, index % columns * spacing, radius * np.cos(angles))
+            y = np.where(is_linear, index // columns * spacing, -radius * np.sin(angles))
+        return BatchPositions(x=x, y=y, mask=mask)
+
     def _create_zero_array(self):
         return ArrayPositions(
             x=np.zeros(self._params.elements),
@@ -47,9 +125,13 @@ class ArrayModel:
         )
     
     def _calculate_array_positions(self):
+        if self._params.array_type == 'custom':
+            return self._calculate_custom_positions()
         if self._params.elements <= 0:
             return ArrayPositions(x=np.array([]), y=np.array([]))
             
+        if self._params.array_type == 'planar':
+            return self._calculate_planar_positions()
         return (self._calculate_linear_positions() 
                 if self._params.array_type == 'linear' 
                 else self._calculate_curved_positions())
@@ -59,6 +141,18 @@ class ArrayModel:
         y = np.zeros_like(x)
         return self._apply_position_offset(x, y)
     
+    def _calculate_planar_positions(self):
+        columns = np.arange(self._params.elements) * self._params.spacing
+        rows = np.arange(max(int(self._params.rows), 1)) * self._params.spacing
+        x = np.tile(columns, rows.size)
+        y = np.repeat(rows, columns.size)
+        return self._apply_position_offset(x, y)
+
+    def _calculate_custom_positions(self):
+        layout = self.load_layout(self._params.layout)
+        x, y = layout.slice_positions(slice(None))
+        return self._apply_position_offset(x, y)
+
     def _calculate_curved_positions(self):
         distance, scale_factor = self._calculate_curved_params(self._params.elements, self._params.curvature)
         if distance == 0 and scale_factor == 0:
@@ -69,7 +163,8 @@ class ArrayModel:
         y = -distance * scale_factor * np.sin(angles)
         return self._apply_position_offset(x, y)
     
-    def _calculate_curved_params(self, elements, curvature):
+    @staticmethod
+    def _calculate_curved_params(elements, curvature):
         cos_term = np.cos(2*np.pi/elements)
         
         # if abs(1 - cos_term) < 1e-10:
@@ -0,0 +1,167 @@
+from dataclasses import dataclass, fields
+import numpy as np
+
+_HALF_POWER_DB = -10 * np.log10(2)
+
+@dataclass
+class BeamMetrics:
+    peak_angle: np.ndarray
+    pointing_error: np.ndarray
+    beamwidth: np.ndarray
+    sidelobe_level: np.ndarray
+    null_count: np.ndarray
+    nulls: np.ndarray
+
+    @classmethod
+    def concatenate(cls, metrics):
+        metrics = list(metrics)
+        return cls(**{field.name: np.concatenate([getattr(item, field.name) for item in metrics])
+                      for field in fields(cls)})
+
+    def __len__(self):
+        return self.peak_angle.size
+
+    def __getitem__(self, index):
+        return BeamMetrics(**{name: value[index] for name, value in vars(self).items()})
+
+
+class AdaptiveAngleSampler:
+    # Starts from a uniform grid and repeatedly bisects the intervals next to local
+    # maxima (main lobe, sidelobe peaks), local minima (nulls) and the main lobe's
+    # half-power crossings, so samples concentrate where the pattern bends.
+
+    def __init__(self, initial=257, max_samples=2048, resolution=1e-4, span=(-np.pi/2, np.pi/2)):
+        self.initial = initial
+        self.max_samples = max_samples
+        self.resolution = resolution
+        self.span = span
+
+    def sample(self, evaluate, initial=None):
+        angles = np.linspace(*self.span, max(int(initial or self.initial), 3))
+        magnitude = np.abs(evaluate(angles))
+        while angles.size < self.max_samples:
+            new_angles = self._refinement_angles(angles, magnitude)[:self.max_samples - angles.size]
+            if new_angles.size == 0:
+                break
+            angles = np.concatenate([angles, new_angles])
+            magnitude = np.concatenate([magnitude, np.abs(evaluate(new_angles))])
+            order = np.argsort(angles, kind='stable')
+            angles, magnitude = angles[order], magnitude[order]
+        return angles, magnitude
+
+    def _refinement_angles(self, angles, magnitude):
+        peak = int(np.argmax(magnitude))
+        above = magnitude >= magnitude[peak] * np.sqrt(0.5)
+        crossings = np.flatnonzero(above[1:] != above[:-1])
+        extrema = np.flatnonzero(_local_extrema(magnitude)) + 1
+
+        starts = np.concatenate([extrema - 1, extrema, crossings, [peak - 1, peak]])
+        starts = np.unique(starts[(starts >= 0) & (starts < angles.size - 1)])
+        width = angles[starts + 1] - angles[starts]
+        keep = width > self.resolution
+        starts, width = starts[keep], width[keep]
+
+        # When the budget runs out the main lobe is refined first, then the coarsest intervals.
+        main_lobe = (np.abs(starts - peak) <= 1) | np.isin(starts, crossings)
+        order = np.lexsort((-width, ~main_lobe))
+        starts = starts[order]
+        return (angles[starts] + angles[starts + 1]) / 2
+
+
+class BeamMetricExtractor:
+    def __init__(self, null_depth=-40.0, max_nulls=16):
+        self.null_depth = null_depth
+        self.max_nulls = max_nulls
+
+    def extract(self, angles, pattern, steering):
+        # Vectorized over rows: pattern is (configurations, angles) in dB, angles are
+        # shared and ascending (uniform or adaptive), steering is per row in radians.
+        angles = np.asarray(angles, dtype=float).reshape(-1)
+        pattern = np.atleast_2d(np.asarray(pattern, dtype=float))
+        rows = np.arange(pattern.shape[0])
+        index = np.arange(angles.size)
+
+        peak = np.argmax(pattern, axis=1)
+        peak_level = pattern[rows, peak]
+        peak_angle = self._refine_peak(angles, pattern, peak)
+        relative = pattern - peak_level[:, None]
+
+        minima = np.zeros(pattern.shape, dtype=bool)
+        minima[:, 1:-1] = _local_minima(relative)
+        beamwidth = self._calculate_beamwidth(angles, relative, peak, index)
+        sidelobe_level = self._calculate_sidelobe_level(relative, minima, peak, index)
+        null_count, nulls = self._collect_nulls(angles, minima & (relative <= self.null_depth))
+
+        return BeamMetrics(
+            peak_angle=peak_angle,
+            pointing_error=peak_angle - np.broadcast_to(np.asarray(steering, dtype=float), peak_angle.shape),
+            beamwidth=beamwidth,
+            sidelobe_level=sidelobe_level,
+            null_count=null_count,
+            nulls=nulls
+        )
+
+    def _refine_peak(self, angles, pattern, peak):
+        # Vertex of the parabola through the peak sample and its neighbours (non-uniform spacing).
+        rows = np.arange(pattern.shape[0])
+        left = np.clip(peak - 1, 0, angles.size - 1)
+        right = np.clip(peak + 1, 0, angles.size - 1)
+        x0, x1, x2 = angles[left], angles[peak], angles[right]
+        y0, y1, y2 = pattern[rows, left], pattern[rows, peak], pattern[rows, right]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = (x0 - x1) * (x0 - x2) * (x1 - x2)
+            a = (x2 * (y1 - y0) + x1 * (y0 - y2) + x0 * (y2 - y1)) / denominator
+            b = (x2**2 * (y0 - y1) + x1**2 * (y2 - y0) + x0**2 * (y1 - y2)) / denominator
+            vertex = -b / (2 * a)
+        valid = (left < peak) & (peak < right) & (a < 0) & np.isfinite(vertex)
+        return np.where(valid, np.clip(vertex, x0, x2), x1)
+
+    def _calculate_beamwidth(self, angles, relative, peak, index):
+        rows = np.arange(relative.shape[0])
+        below = relative < _HALF_POWER_DB
+
+        right_mask = below & (index > peak[:, None])
+        right = np.argmax(right_mask, axis=1)
+        left_mask = below & (index < peak[:, None])
+        left = angles.size - 1 - np.argmax(left_mask[:, ::-1], axis=1)
+
+        right_angle = self._interpolate_crossing(angles, relative, rows, np.maximum(right - 1, 0), right)
+        left_angle = self._interpolate_crossing(angles, relative, rows, left, np.minimum(left + 1, angles.size - 1))
+        found = right_mask.any(axis=1) & left_mask.any(axis=1)
+        return np.where(found, right_angle - left_angle, np.nan)
+
+    def _interpolate_crossing(self, angles, relative, rows, start, stop):
+        y0, y1 = relative[rows, start], relative[rows, stop]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(y1 != y0, (_HALF_POWER_DB - y0) / (y1 - y0), 0.0)
+        fraction = np.clip(np.nan_to_num(fraction), 0.0, 1.0)
+        return angles[start] + fraction * (angles[stop] - angles[start])
+
+    def _calculate_sidelobe_level(self, relative, minima, peak, index):
+        # The main lobe spans the first local minimum on each side of the peak.
+        after = minima & (index > peak[:, None])
+        before = minima & (index < peak[:, None])
+        first_after = np.where(after.any(axis=1), np.argmax(after, axis=1), index.size)
+        last_before = np.where(before.any(axis=1), index.size - 1 - np.argmax(before[:, ::-1], axis=1), -1)
+        outside = (index < last_before[:, None]) | (index > first_after[:, None])
+        level = np.max(np.where(outside, relative, -np.inf), axis=1)
+        return np.where(np.isfinite(level), level, np.nan)
+
+    def _collect_nulls(self, angles, null_mask):
+        null_count = null_mask.sum(axis=1)
+        nulls = np.full((null_mask.shape[0], self.max_nulls), np.nan)
+        slot = np.cumsum(null_mask, axis=1) - 1
+        rows, columns = np.nonzero(null_mask & (slot < self.max_nulls))
+        nulls[rows, slot[rows, columns]] = angles[columns]
+        return null_count, nulls
+
+
+def _local_extrema(values):
+    interior, left, right = values[..., 1:-1], values[..., :-2], values[..., 2:]
+    maxima = (interior > left) & (interior >= right)
+    return maxima | _local_minima(values)
+
+
+def _local_minima(values):
+    interior, left, right = values[..., 1:-1], values[..., :-2], values[..., 2:]
+    return (interior < left) & (interior <= right)
@@ -1,7 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import numpy as np
 from model.array_model import ArrayModel
-from controller.base_controller import BaseController
+from model.beam_metrics import AdaptiveAngleSampler, BeamMetricExtractor, BeamMetrics
+from model.cache import LRUCache, array_key
+from model.cancellation import check_cancelled
+from model.field_solver import FieldSolver, FieldSources
+from model.fused_kernel import ArrayFactorKernel
+from model.fast_patterns import UniformLinearStrategy
+from model.profiling import profiled
+from model.unit_cache import UnitFieldCache
+
+# Working-set size for one vectorized block; larger blocks fall out of cache without getting faster.
+_BLOCK_BYTES = 2**20
 
 @dataclass
 class BeamformingParameters:
@@ -14,88 +24,697 @@ class BeamformingParameters:
     phase: float
     x_position: float = 0
     y_position: float = 0
+    rows: int = 1
+    layout: object = None
+
+    @classmethod
+    def from_dict(cls, params):
+        if isinstance(params, cls):
+            return params
+        names = {field.name for field in fields(cls)}
+        return cls(**{name: value for name, value in params.items() if name in names})
+
+
+@dataclass
+class BatchParameters:
+    elements: np.ndarray
+    spacing: np.ndarray
+    steering: np.ndarray
+    curvature: np.ndarray
+    frequency: np.ndarray
+    phase: np.ndarray
+    x_position: np.ndarray
+    y_position: np.ndarray
+    is_linear: np.ndarray
+    rows: np.ndarray = None
+    layout: np.ndarray = None
+
+    def __post_init__(self):
+        # Planar arrays are linear rows stacked along y; linear and curved arrays have one row.
+        if self.rows is None:
+            self.rows = np.ones_like(self.elements)
+        # Custom rows carry their ElementLayout; every other row holds None.
+        if self.layout is None:
+            self.layout = np.full(np.shape(self.elements), None, dtype=object)
+
+    @property
+    def element_counts(self):
+        return self.elements * self.rows
+
+    @property
+    def is_custom(self):
+        return np.array([layout is not None for layout in np.atleast_1d(self.layout)], dtype=bool)
+
+    @classmethod
+    def from_list(cls, params_list):
+        params_list = [BeamformingParameters.from_dict(params) for params in params_list]
+        columns = {name: np.array([getattr(params, name) for params in params_list], dtype=float)
+                   for name in ('spacing', 'steering', 'curvature', 'frequency',
+                                'phase', 'x_position', 'y_position')}
+        layout = np.full(len(params_list), None, dtype=object)
+        for index, params in enumerate(params_list):
+            if params.array_type == 'custom':
+                layout[index] = ArrayModel.load_layout(params.layout)
+        return cls(
+            elements=np.array([ArrayModel.element_count(params) if params.array_type == 'custom'
+                               else int(params.elements) for params in params_list], dtype=int),
+            is_linear=np.array([params.array_type != 'curved' for params in params_list], dtype=bool),
+            rows=np.array([int(params.rows) if params.array_type == 'planar' else 1 for params in params_list],
+                          dtype=int),
+            layout=layout,
+            **columns
+        )
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __getitem__(self, index):
+        return BatchParameters(**{name: value[index] for name, value in vars(self).items()})
 
 
 class ArrayStrategy:
     @staticmethod
-    def calculate_linear_weights(wave_number, params, steering_angle):
-        phase = (np.arange(params.elements) * params.spacing).reshape(-1, 1) 
-        steering = np.asarray(steering_angle).reshape(1, -1)  
-        return np.exp(-1j * wave_number * phase * np.sin(steering))
+    def calculate_linear_weights(wave_number, params, steering_angle, dtype=float):
+        phase = (np.arange(params.elements, dtype=dtype) * dtype(wave_number * params.spacing)).reshape(-1, 1)
+        steering = np.asarray(steering_angle, dtype=dtype).reshape(1, -1)  
+        return np.exp(-1j * phase * np.sin(steering))
 
     @staticmethod
-    def calculate_curved_weights(wave_number, params, steering_angle):
-        temp_model = ArrayModel()
-        distance, scale_factor = temp_model._calculate_curved_params(params.elements, params.curvature)
+    def calculate_curved_weights(wave_number, params, steering_angle, dtype=float):
+        distance, scale_factor = ArrayModel._calculate_curved_params(params.elements, params.curvature)
         wave_length = 2 * np.pi / wave_number
         theta = 2 * np.pi / params.elements * np.arange(params.elements) 
-        x = (distance * scale_factor * np.cos(theta)).reshape(-1, 1)
-        y = (-distance * scale_factor * np.sin(theta)).reshape(-1, 1)
-        steering = np.asarray(steering_angle).reshape(1, -1)
-        return np.exp(1j * (2 * np.pi / wave_length) * (x * np.cos(steering) + y * np.sin(steering)))
+        x = (distance * scale_factor * np.cos(theta)).reshape(-1, 1).astype(dtype)
+        y = (-distance * scale_factor * np.sin(theta)).reshape(-1, 1).astype(dtype)
+        steering = np.asarray(steering_angle, dtype=dtype).reshape(1, -1)
+        return np.exp(1j * dtype(2 * np.pi / wave_length) * (x * np.cos(steering) + y * np.sin(steering)))
+
+    @staticmethod
+    def calculate_planar_weights(wave_number, params, steering_angle, dtype=float):
+        # Row-major elements x rows grid, as in ArrayModel._calculate_planar_positions.
+        columns = np.arange(params.elements, dtype=dtype) * dtype(params.spacing)
+        rows = np.arange(max(int(params.rows), 1), dtype=dtype) * dtype(params.spacing)
+        x = np.tile(columns, rows.size).reshape(-1, 1)
+        y = np.repeat(rows, columns.size).reshape(-1, 1)
+        steering = np.asarray(steering_angle, dtype=dtype).reshape(1, -1)
+        return np.exp(-1j * dtype(wave_number) * (x * np.sin(steering) + y * np.cos(steering)))
+
+    @staticmethod
+    def calculate_custom_weights(wave_number, params, steering_angle, dtype=float):
+        x, y = ArrayModel.load_layout(params.layout).slice_positions(slice(None), dtype)
+        steering = np.asarray(steering_angle, dtype=dtype).reshape(1, -1)
+        return np.exp(-1j * dtype(wave_number) * (x.reshape(-1, 1) * np.sin(steering) +
+                                                  y.reshape(-1, 1) * np.cos(steering)))
 
 class BeamformingModel:
     def __init__(self):
         self._array = ArrayModel()
         self._array_strategy = ArrayStrategy()
-        self.base_controller = BaseController()
+        self._uniform_linear_strategy = UniformLinearStrategy()
+        self.speed_of_light = 3e8
         self.magnitude_min = -60
         self.magnitude_max = 0
+        self.memory_budget = 64 * 2**20
+        self.grid_resolution = 200
+        self.grid_extent = 10
+        self.pattern_method = 'auto'
+        self.fft_tolerance = 1e-5
+        self.precision = 'double'
+        self.field_solver = FieldSolver()
+        self.angle_sampler = AdaptiveAngleSampler()
+        self.metric_extractor = BeamMetricExtractor()
+        self.unit_cache = UnitFieldCache()
+        self.kernel = ArrayFactorKernel()
+        self._steering_cache = LRUCache(maxsize=64)
+        self._weight_cache = LRUCache(maxsize=512, max_bytes=128 * 2**20)
+        # Angles, mask and pixel indices per resolution; room for the preview and refined grids.
+        self._grid_cache = LRUCache(maxsize=8)
+
+    @property
+    def real_dtype(self):
+        return np.dtype(np.float32 if self.precision == 'single' else np.float64)
+
+    @property
+    def complex_dtype(self):
+        return np.dtype(np.complex64 if self.precision == 'single' else np.complex128)
+
+    def precision_error(self, compute):
+        # Largest dB difference between single and double precision over the displayed range.
+        previous = self.precision
+        results = {}
+        try:
+            for precision in ('double', 'single'):
+                self.precision = precision
+                results[precision] = np.clip(compute(self), self.magnitude_min, self.magnitude_max)
+        finally:
+            self.precision = previous
+        return float(np.max(np.abs(results['single'].astype(float) - results['double'])))
 
+    def cache_info(self):
+        return {
+            'positions': ArrayModel.cache_info(),
+            'steering': self._steering_cache.info(),
+            'weights': self._weight_cache.info(),
+            'grid': self._grid_cache.info(),
+            'kernel': self.kernel.info()
+        }
+
+    def clear_caches(self):
+        for cache in (ArrayModel._position_cache, self._steering_cache, self._weight_cache, self._grid_cache,
+                      self.unit_cache, self.kernel):
+            cache.clear()
+
+    @profiled('model.steering_vector')
     def calculate_steering_vector(self, params, use_phase=False):
-        wave_number = self.base_controller._calculate_wavenumber(params.frequency)
+        key = (ArrayModel.geometry_key(params), params.frequency, params.steering,
+               self._calculate_phase(params.phase, use_phase), params.x_position, params.y_position, self.precision)
+        return self._steering_cache.get_or_compute(key, lambda: self._calculate_steering_vector(params, use_phase))
+
+    def _calculate_steering_vector(self, params, use_phase):
+        wave_number = self._calculate_wavenumber(params.frequency)
         phase = self._calculate_phase(params.phase, use_phase)
         
         if params.array_type == 'linear':
-            return self.calculate_linear_steering_vector(wave_number, params, phase)
-        return self.calculate_curved_steering_vector(wave_number, params, phase)
+            steering_vector = self.calculate_linear_steering_vector(wave_number, params, phase)
+        elif params.array_type == 'planar':
+            steering_vector = self.calculate_planar_steering_vector(wave_number, params, phase)
+        elif params.array_type == 'custom':
+            steering_vector = self.calculate_custom_steering_vector(wave_number, params, phase)
+        else:
+            steering_vector = self.calculate_curved_steering_vector(wave_number, params, phase)
+        return steering_vector.astype(self.complex_dtype, copy=False)
 
     def calculate_linear_steering_vector(self, wave_number, params, phase):
         x = np.arange(params.elements) * params.spacing
         array_phase = wave_number * x * np.sin(params.steering)
-        position_phase = wave_number * (params.x_position * np.cos(params.steering) + 
-                                    params.y_position * np.sin(params.steering))
+        position_phase = self._calculate_position_phase(wave_number, params)
+        return np.exp(-1j * (array_phase + position_phase + phase))
+
+    def calculate_planar_steering_vector(self, wave_number, params, phase):
+        positions = self._array.calculate_positions({**vars(params), 'x_position': 0, 'y_position': 0})
+        array_phase = wave_number * (positions.x * np.sin(params.steering) + positions.y * np.cos(params.steering))
+        position_phase = self._calculate_position_phase(wave_number, params)
         return np.exp(-1j * (array_phase + position_phase + phase))
 
+    def calculate_custom_steering_vector(self, wave_number, params, phase):
+        # Custom layouts use the planar convention; optional per-element weights scale the excitation.
+        layout = ArrayModel.load_layout(params.layout)
+        x, y = layout.slice_positions(slice(None))
+        array_phase = wave_number * (x * np.sin(params.steering) + y * np.cos(params.steering))
+        position_phase = self._calculate_position_phase(wave_number, params)
+        steering_vector = np.exp(-1j * (array_phase + position_phase + phase))
+        if layout.is_weighted:
+            steering_vector *= layout.slice_weights(slice(None))
+        return steering_vector
+
     def calculate_curved_steering_vector(self, wave_number, params, phase):
         distance, scale_factor = self._array._calculate_curved_params(params.elements, params.curvature)
         wave_length = 2 * np.pi / wave_number
-        x = distance * scale_factor * np.cos(2 * np.pi / params.elements * np.arange(params.elements)) + params.x_position
-        y = -distance * scale_factor * np.sin(2 * np.pi / params.elements * np.arange(params.elements)) + params.y_position
-        steering_vector = np.exp(1j * (2 * np.pi / wave_length) * (x * np.cos(params.steering) + y * np.sin(params.steering)))
+        x = distance * scale_factor * np.cos(2 * np.pi / params.elements * np.arange(params.elements))
+        y = -distance * scale_factor * np.sin(2 * np.pi / params.elements * np.arange(params.elements))
+        array_phase = (2 * np.pi / wave_length) * (x * np.cos(params.steering) + y * np.sin(params.steering))
+        steering_vector = np.exp(1j * (array_phase - self._calculate_position_phase(wave_number, params)))
         return steering_vector.reshape(-1, 1) 
+
+    def _calculate_position_phase(self, wave_number, params):
+        # The unit offset is compensated along the look direction (sin(s), cos(s)) from broadside,
+        # the same convention calculate_multi_unit_array_factor uses to place each unit, so all
+        # units add coherently at the steering angle.
+        return wave_number * (params.x_position * np.sin(params.steering) + params.y_position * np.cos(params.steering))
+    @profiled('model.weights')
     def calculate_weights(self, params, steering_angle):
-        wave_number = self.base_controller._calculate_wavenumber(params.frequency)
+        key = (ArrayModel.geometry_key(params), params.frequency, array_key(steering_angle), self.precision)
+        return self._weight_cache.get_or_compute(key, lambda: self._calculate_weights(params, steering_angle))
+
+    def _calculate_weights(self, params, steering_angle):
+        wave_number = self._calculate_wavenumber(params.frequency)
         if params.array_type == 'linear':
-            return self._array_strategy.calculate_linear_weights(wave_number, params, steering_angle)
-        return self._array_strategy.calculate_curved_weights(wave_number, params, steering_angle)
+            return self._array_strategy.calculate_linear_weights(wave_number, params, steering_angle, self.real_dtype.type)
+        if params.array_type == 'planar':
+            return self._array_strategy.calculate_planar_weights(wave_number, params, steering_angle, self.real_dtype.type)
+        if params.array_type == 'custom':
+            return self._array_strategy.calculate_custom_weights(wave_number, params, steering_angle, self.real_dtype.type)
+        return self._array_strategy.calculate_curved_weights(wave_number, params, steering_angle, self.real_dtype.type)
 
+    @profiled('model.pattern')
     def calculate_pattern(self, params, angles, use_phase):
+        angles = np.asarray(angles, dtype=self.real_dtype)
+        if self._select_pattern_method(params) == 'chunked':
+            steering_vector = self.calculate_steering_vector(params, use_phase)
+            return self._normalize_decibels(self._calculate_layout_decibels(params, steering_vector, angles))
         array_factor = self._calculate_array_factor(params, angles, use_phase)
         return self._normalize_pattern(array_factor)
 
-    def calculate_interference_pattern(self, params):
-        grid = self._setup_interference_grid()
-        params = BeamformingParameters(**params[0])
-        steering_angles = np.arctan2(grid['Y'], grid['X'])
-        array_factor = self._calculate_array_factor(params, steering_angles.reshape(-1), False)
-        return self._normalize_pattern(array_factor.reshape(grid['X'].shape))
+    def calculate_pattern_batch(self, params_list, angles, use_phase):
+        array_factor = self.calculate_array_factor_batch(params_list, angles, use_phase)
+        return self._normalize_pattern(array_factor, axis=-1)
+
+    @profiled('model.adaptive_pattern')
+    def calculate_adaptive_pattern(self, params_list, use_phase):
+        batch = params_list if isinstance(params_list, BatchParameters) else BatchParameters.from_list(params_list)
+        evaluate = lambda angles: self.calculate_multi_unit_array_factor(batch, angles, use_phase)
+        angles, magnitude = self.angle_sampler.sample(evaluate, self._angular_sample_count(batch))
+        return angles, self._normalize_pattern(magnitude)
+
+    def _angular_sample_count(self, batch):
+        # Lobes are about wavelength/aperture wide in sin(theta), so the starting grid
+        # gets a few samples per lobe across the whole aperture of all units.
+        custom = batch.is_custom
+        positions = self._array.calculate_batch_positions(
+            np.where(custom, 0, batch.elements), batch.spacing, batch.curvature, batch.is_linear, batch.rows
+        )
+        bounds = [(x_min + x_offset, x_max + x_offset, y_min + y_offset, y_max + y_offset)
+                  for (x_min, x_max, y_min, y_max), x_offset, y_offset in
+                  ((layout.bounds, batch.x_position[row], batch.y_position[row])
+                   for row, layout in zip(np.flatnonzero(custom), batch.layout[custom]))]
+        if not positions.mask.any() and not bounds:
+            return self.angle_sampler.initial
+        x = np.concatenate([(positions.x + batch.x_position[:, None])[positions.mask],
+                            [value for bound in bounds for value in bound[:2]]])
+        y = np.concatenate([(positions.y + batch.y_position[:, None])[positions.mask],
+                            [value for bound in bounds for value in bound[2:]]])
+        aperture = np.hypot(np.ptp(x), np.ptp(y))
+        wavelengths = aperture * self.calculate_wavenumbers(batch.frequency).max() / (2 * np.pi)
+        return int(np.clip(8 * wavelengths + 1, self.angle_sampler.initial, self.angle_sampler.max_samples // 2))
+
+    @profiled('model.beam_metrics')
+    def calculate_beam_metrics_batch(self, params_list, angles, use_phase=False):
+        batch = params_list if isinstance(params_list, BatchParameters) else BatchParameters.from_list(params_list)
+        angles = np.asarray(angles, dtype=float).reshape(-1)
+        # Patterns are reduced to metrics chunk by chunk and never held for the whole batch.
+        rows_per_chunk = max(1, int(self.memory_budget // max(angles.size * 64, 1)))
+        metrics = [
+            self.metric_extractor.extract(
+                angles, self.calculate_pattern_batch(batch[start:start + rows_per_chunk], angles, use_phase),
+                batch.steering[start:start + rows_per_chunk]
+            )
+            for start in range(0, max(len(batch), 1), rows_per_chunk)
+        ]
+        return BeamMetrics.concatenate(metrics)
+
+    @profiled('model.batch')
+    def calculate_array_factor_batch(self, params_list, angles, use_phase=False):
+        batch = params_list if isinstance(params_list, BatchParameters) else BatchParameters.from_list(params_list)
+        real = self.real_dtype
+        angles = np.asarray(angles, dtype=real).reshape(-1)
+        # Custom layouts are evaluated per row in element chunks and stay out of the padded arrays.
+        custom = batch.is_custom
+        element_counts = np.where(custom, 0, batch.element_counts)
+        positions = self._array.calculate_batch_positions(
+            np.where(custom, 0, batch.elements), batch.spacing, batch.curvature, batch.is_linear, batch.rows
+        )
+        positions.x, positions.y = positions.x.astype(real), positions.y.astype(real)
+        wave_numbers = self.calculate_wavenumbers(batch.frequency)
+        steering_vectors = self._calculate_batch_steering_vectors(batch, positions, wave_numbers, use_phase)
+
+        itemsize = self.complex_dtype.itemsize
+        array_factor = np.empty((len(batch), angles.size), dtype=self.complex_dtype)
+        for row in np.flatnonzero(custom):
+            params = batch[row]
+            steering_vector = self.calculate_custom_steering_vector(
+                wave_numbers[row], params, self._calculate_phase(params.phase, use_phase)
+            )
+            array_factor[row] = self._accumulate_layout_factor(
+                params.layout, wave_numbers[row], steering_vector.astype(self.complex_dtype), angles
+            )
+
+        analytic = self.pattern_method in ('auto', 'analytic')
+        linear = np.flatnonzero(batch.is_linear & ~custom & (analytic | (batch.rows == 1)))
+        for rows, columns in self._batch_chunks(element_counts, linear, lambda n: angles.size * 3 * itemsize):
+            if analytic:
+                array_factor[rows] = self._calculate_dirichlet_batch_factor(
+                    batch[rows], wave_numbers[rows], steering_vectors[rows, columns], angles
+                )
+            else:
+                array_factor[rows] = self._calculate_linear_batch_factor(
+                    batch.spacing[rows], wave_numbers[rows], steering_vectors[rows, columns], angles
+                )
+
+        planar = np.flatnonzero(batch.is_linear & ~custom & ~analytic & (batch.rows > 1))
+        for rows, columns in self._batch_chunks(element_counts, planar, lambda n: n * angles.size * 2 * itemsize):
+            array_factor[rows] = self._calculate_planar_batch_factor(
+                positions.x[rows, columns], positions.y[rows, columns],
+                wave_numbers[rows], steering_vectors[rows, columns], angles
+            )
+
+        curved = np.flatnonzero(~batch.is_linear)
+        for rows, columns in self._batch_chunks(element_counts, curved, lambda n: n * angles.size * 2 * itemsize):
+            array_factor[rows] = self._calculate_curved_batch_factor(
+                positions.x[rows, columns], positions.y[rows, columns],
+                wave_numbers[rows], steering_vectors[rows, columns], angles
+            )
+        return array_factor
+
+    def _batch_chunks(self, elements, rows, bytes_per_row):
+        # Rows are sorted by element count so each chunk is only padded to its own maximum.
+        rows = rows[np.argsort(elements[rows], kind='stable')]
+        block_bytes = self._block_bytes()
+        start = 0
+        while start < rows.size:
+            row_bytes = max(bytes_per_row(max(int(elements[rows[start]]), 1)), 1)
+            chunk = rows[start:start + max(1, int(block_bytes // row_bytes))]
+            yield chunk, slice(0, max(int(elements[chunk].max()), 0))
+            start += chunk.size
+
+    def _calculate_batch_steering_vectors(self, batch, positions, wave_numbers, use_phase):
+        real = self.real_dtype
+        steering = batch.steering[:, None].astype(real)
+        phase = self._calculate_phase(batch.phase, use_phase)
+        phase = np.broadcast_to(phase, batch.phase.shape)[:, None].astype(real)
+        k = wave_numbers[:, None]
+
+        position_phase = k * (batch.x_position[:, None].astype(real) * np.sin(steering) +
+                              batch.y_position[:, None].astype(real) * np.cos(steering))
+        linear_phase = -(k * (positions.x * np.sin(steering) + positions.y * np.cos(steering)) + position_phase + phase)
+        curved_phase = k * (positions.x * np.cos(steering) + positions.y * np.sin(steering)) - position_phase
+
+        steering_phase = np.where(batch.is_linear[:, None], linear_phase, curved_phase)
+        return np.where(positions.mask, np.exp(1j * steering_phase), 0)
+
+    def _calculate_linear_batch_factor(self, spacing, wave_numbers, steering_vectors, angles):
+        # Element n of a linear array contributes sv_n * z**n with z = exp(j*k*d*sin(theta)),
+        # so the sum is a polynomial in z evaluated with Horner's scheme instead of N*M exps.
+        z = np.exp(1j * (wave_numbers * spacing).astype(angles.dtype)[:, None] * np.sin(angles))
+        array_factor = np.zeros_like(z)
+        for column in range(steering_vectors.shape[1] - 1, -1, -1):
+            array_factor *= z
+            array_factor += steering_vectors[:, column, None]
+        return array_factor
+
+    def _calculate_dirichlet_batch_factor(self, batch, wave_numbers, steering_vectors, angles):
+        if steering_vectors.shape[1] == 0:
+            return np.zeros((len(batch), angles.size), dtype=steering_vectors.dtype)
+        scale = (wave_numbers * batch.spacing).astype(angles.dtype)[:, None]
+        psi = scale * (np.sin(angles) - np.sin(batch.steering).astype(angles.dtype)[:, None])
+        kernel = self._uniform_linear_strategy.dirichlet_kernel(batch.elements[:, None], psi)
+        planar = batch.rows > 1
+        if planar.any():
+            # A uniform planar array is separable: the row factor along y multiplies the linear one.
+            psi_rows = scale[planar] * (np.cos(angles) - np.cos(batch.steering[planar]).astype(angles.dtype)[:, None])
+            kernel[planar] *= self._uniform_linear_strategy.dirichlet_kernel(batch.rows[planar, None], psi_rows)
+        return steering_vectors[:, :1] * kernel
+
+    def _calculate_planar_batch_factor(self, x, y, wave_numbers, steering_vectors, angles):
+        k = wave_numbers[:, None]
+        return self.kernel.array_factor(x, y, steering_vectors, k * np.sin(angles), k * np.cos(angles),
+                                        block_bytes=self._block_bytes())
+
+    def _calculate_curved_batch_factor(self, x, y, wave_numbers, steering_vectors, angles):
+        k = -wave_numbers[:, None]
+        return self.kernel.array_factor(x, y, steering_vectors, k * np.cos(angles), k * np.sin(angles),
+                                        block_bytes=self._block_bytes())
+
+    def _calculate_wavenumber(self, frequency):
+        wave_length = self.speed_of_light / ((frequency if frequency > 0 else 1) * 1e6)
+        return 2 * np.pi / wave_length
+
+    def calculate_wavenumbers(self, frequencies):
+        frequencies = np.where(np.asarray(frequencies, dtype=float) <= 0, 1.0, frequencies)
+        wave_numbers = 2 * np.pi * frequencies * 1e6 / self.speed_of_light
+        return wave_numbers.astype(self.real_dtype)
+
+    @profiled('model.interference')
+    def calculate_interference_pattern(self, params, resolution=None, cancelled=None):
+        # Only the visible pixels are evaluated, as one packed vector that is scattered back into the image.
+        x, y = self._setup_interference_grid(resolution)
+        visible = self.visible_pixels(x.size)
+        grid_angles = self._grid_cache.get_or_compute(
+            ('angles', x.size, self.grid_extent, self.precision),
+            lambda: np.arctan2(y[visible // x.size], x[visible % x.size]).astype(self.real_dtype)
+        )
+        if len(params) > 1:
+            array_factor = self.unit_cache.total(
+                ('far', x.size, self.grid_extent, self.precision), self._unit_entries(params),
+                lambda unit: self._calculate_unit_interference(unit, grid_angles, cancelled)
+            )
+            return self._scatter_visible(self._normalize_pattern(array_factor), visible, x.size)
+
+        evaluate, bytes_per_angle = self._interference_evaluator(params, grid_angles.size)
+        decibels = np.empty(grid_angles.size, dtype=self.real_dtype)
+        for pixels in self._packed_tiles(grid_angles.size, bytes_per_angle):
+            check_cancelled(cancelled)
+            evaluate(grid_angles[pixels], decibels[pixels])
+        return self._scatter_visible(self._normalize_decibels(decibels), visible, x.size)
+
+    def _calculate_unit_interference(self, params, grid_angles, cancelled=None):
+        # One unit's term of the coherent multi-unit sum, including the phase of its offset.
+        batch = BatchParameters.from_list([params])
+        array_factor = np.empty(grid_angles.size, dtype=self.complex_dtype)
+        for pixels in self._packed_tiles(grid_angles.size, 3 * self.complex_dtype.itemsize):
+            check_cancelled(cancelled)
+            array_factor[pixels] = self.calculate_multi_unit_array_factor(batch, grid_angles[pixels], False)
+        return array_factor
+
+    def _unit_entries(self, params_list):
+        # Units are tracked by their 'id' (list position when ids are missing or repeated);
+        # the signature covers everything that changes a unit's contribution.
+        ids = [params.get('id') if isinstance(params, dict) else None for params in params_list]
+        if None in ids or len(set(ids)) != len(ids):
+            ids = list(range(len(params_list)))
+        entries = []
+        for unit_id, params in zip(ids, params_list):
+            unit = BeamformingParameters.from_dict(params)
+            signature = (ArrayModel.geometry_key(unit), unit.frequency, unit.steering, unit.phase,
+                         unit.x_position, unit.y_position)
+            entries.append((unit_id, signature, unit))
+        return entries
+
+    def visible_mask(self, resolution=None):
+        # The map shows the upper half-disk of the displayed image; the grid is stored rotated
+        # by -90 degrees relative to the display (see _calculate_field_sources).
+        resolution = resolution or self.grid_resolution
+        def calculate():
+            y, x = np.ogrid[-resolution//2:resolution//2, -resolution//2:resolution//2]
+            displayed = (x*x + y*y <= (resolution//2)**2) & (y <= 0)
+            return np.ascontiguousarray(np.rot90(displayed, -1))
+        return self._grid_cache.get_or_compute(('mask', resolution), calculate)
+
+    def visible_pixels(self, resolution=None):
+        resolution = resolution or self.grid_resolution
+        return self._grid_cache.get_or_compute(
+            ('pixels', resolution), lambda: np.flatnonzero(self.visible_mask(resolution))
+        )
+
+    def _scatter_visible(self, values, visible, resolution):
+        image = np.full((resolution, resolution), self.magnitude_min, dtype=values.dtype)
+        image.reshape(-1)[visible] = values
+        return image
+
+    def _interference_evaluator(self, params_list, angle_count):
+        # The evaluator writes 20*log10|AF| for a tile of angles into the given output slice.
+        itemsize = self.complex_dtype.itemsize
+        params = BeamformingParameters.from_dict(params_list[0])
+        steering_vector = self.calculate_steering_vector(params, False)
+        method = self._select_pattern_method(params)
+        decibels = self.kernel.decibels
+        if method == 'analytic':
+            evaluate = lambda angles, out: decibels(
+                self._calculate_dirichlet_array_factor(params, steering_vector, angles), out
+            )
+            return evaluate, 8 * itemsize
+        if method == 'fft':
+            spectrum = self._fft_spectrum(params, steering_vector)
+            evaluate = lambda angles, out: decibels(self._interpolate_spectrum(params, spectrum, angles), out)
+            return evaluate, 8 * itemsize
+        if method == 'chunked':
+            evaluate = lambda angles, out: self._calculate_layout_decibels(params, steering_vector, angles, out)
+            return evaluate, 8 * itemsize
+        # The grid angles repeat every frame, so the tile weights are cached while the whole grid's
+        # weights fit in the memory budget; beyond that each tile is computed and dropped.
+        bytes_per_angle = max(ArrayModel.element_count(params), 1) * itemsize
+        cached = bytes_per_angle * angle_count <= self.memory_budget
+        weights = self.calculate_weights if cached else self._calculate_weights
+        evaluate = lambda angles, out: decibels(self._apply_weights(weights(params, angles), steering_vector), out)
+        return evaluate, 3 * bytes_per_angle
+
+    def calculate_multi_unit_pattern(self, params_list, angles, use_phase):
+        if len(params_list) == 1:
+            return self.calculate_pattern(BeamformingParameters.from_dict(params_list[0]), angles, use_phase)
+        array_factor = self.calculate_multi_unit_array_factor(params_list, angles, use_phase)
+        return self._normalize_pattern(array_factor)
+
+    @profiled('model.multi_unit')
+    def calculate_multi_unit_array_factor(self, params_list, angles, use_phase=False):
+        # Coherent sum over units: each unit's own array factor times the phase its
+        # offset adds along the look direction (sin(theta), cos(theta)) from broadside.
+        batch = params_list if isinstance(params_list, BatchParameters) else BatchParameters.from_list(params_list)
+        real = self.real_dtype
+        angles = np.asarray(angles, dtype=real).reshape(-1)
+        array_factors = self.calculate_array_factor_batch(batch, angles, use_phase)
+        wave_numbers = self.calculate_wavenumbers(batch.frequency)
+        self.kernel.shift(array_factors, wave_numbers * batch.x_position.astype(real),
+                          wave_numbers * batch.y_position.astype(real), np.sin(angles), np.cos(angles))
+        return array_factors.sum(axis=0)
+
+    @profiled('model.field')
+    def calculate_field_pattern(self, params_list, resolution=None, cancelled=None):
+        x, y = self._setup_interference_grid(resolution)
+        visible = self.visible_pixels(x.size)
+        self.field_solver.memory_budget = self.memory_budget
+        self.field_solver.dtype = self.complex_dtype
+        solve = lambda sources: self.field_solver.calculate_field_points(
+            sources, x[visible % x.size], y[visible // x.size], self.field_solver.minimum_distance(x, y), cancelled
+        )
+        if len(params_list) > 1:
+            field = self.unit_cache.total(
+                ('near', x.size, self.grid_extent, self.precision), self._unit_entries(params_list),
+                lambda unit: solve(self._calculate_field_sources(unit))
+            )
+        else:
+            field = solve(FieldSources.concatenate(self._calculate_field_sources(params) for params in params_list))
+        return self._scatter_visible(self._normalize_pattern(field), visible, x.size)
+
+    def _calculate_field_sources(self, params):
+        params = BeamformingParameters.from_dict(params)
+        positions = self._array.calculate_positions(vars(params))
+        wave_number = self._calculate_wavenumber(params.frequency)
+        # Delay-and-sum weights that focus every element towards the steering direction,
+        # measured from the array broadside (+y) like the beam pattern.
+        delay = wave_number * (positions.x * np.sin(params.steering) + positions.y * np.cos(params.steering))
+        weights = np.exp(-1j * (delay + self._calculate_phase(params.phase)))
+        layout = ArrayModel.load_layout(params.layout) if params.array_type == 'custom' else None
+        if layout is not None and layout.is_weighted:
+            weights *= layout.slice_weights(slice(None))
+        # The interference image is stored with rows along the display's horizontal axis
+        # (the controller rotates it by 90 degrees), so array x maps onto grid y.
+        return FieldSources(x=positions.y, y=positions.x, weights=weights, wave_number=wave_number)
+
+    def _packed_tiles(self, count, bytes_per_item):
+        items_per_tile = max(1, int(self._block_bytes() // max(bytes_per_item, 1)))
+        for start in range(0, count, items_per_tile):
+            yield slice(start, min(start + items_per_tile, count))
+
+    def _block_bytes(self):
+        return min(self.memory_budget, _BLOCK_BYTES)
 
     def _calculate_array_factor(self, params, steering_angle, use_phase):
-        steering_vector = self.calculate_steering_vector(params, use_phase).reshape(-1, 1)
+        steering_vector = self.calculate_steering_vector(params, use_phase)
+        method = self._select_pattern_method(params)
+        if method == 'analytic':
+            return self._calculate_dirichlet_array_factor(params, steering_vector, steering_angle)
+        if method == 'fft':
+            spectrum = self._fft_spectrum(params, steering_vector)
+            return self._interpolate_spectrum(params, spectrum, steering_angle)
+        if method == 'chunked':
+            return self._calculate_chunked_array_factor(params, steering_vector, steering_angle)
         weights = self.calculate_weights(params, steering_angle)
-        return np.sum(weights.conj() * steering_vector, axis=0)
+        return self._apply_weights(weights, steering_vector)
+
+    @profiled('model.array_factor')
+    def _apply_weights(self, weights, steering_vector):
+        # sum(conj(W) * sv, axis=0) == conj(conj(sv) @ W): one matrix-vector product
+        # over the cached weights, without an elements x angles temporary.
+        array_factor = np.conj(steering_vector).reshape(-1) @ weights
+        return np.conj(array_factor, out=array_factor)
+
+    def fft_error_bound(self, params):
+        padded_length = self._uniform_linear_strategy.fft_padded_length(params.elements, self.fft_tolerance)
+        return self._uniform_linear_strategy.fft_error_bound(params.elements, padded_length)
+
+    def _select_pattern_method(self, params):
+        # Linear steering vectors are unit-modulus with a progressive phase, so every
+        # linear array is a uniform linear array and has a closed-form pattern; the FFT
+        # pattern is only used when asked for. A uniform planar array is the product of
+        # its row and column patterns. Custom layouts can be far too large for an
+        # elements x angles weight matrix.
+        if params.array_type == 'custom':
+            return 'chunked'
+        if params.array_type == 'curved' or self.pattern_method == 'direct':
+            return 'direct'
+        if params.array_type == 'linear' and self.pattern_method == 'fft':
+            return 'fft'
+        return 'analytic'
+
+    @profiled('model.array_factor')
+    def _calculate_chunked_array_factor(self, params, steering_vector, angles):
+        wave_number = self._calculate_wavenumber(params.frequency)
+        return self._accumulate_layout_factor(
+            ArrayModel.load_layout(params.layout), wave_number, steering_vector,
+            np.asarray(angles, dtype=self.real_dtype).reshape(-1)
+        )
+
+    def _accumulate_layout_factor(self, layout, wave_number, steering_vector, angles):
+        # Sum sv_n * exp(j*k*(x_n*sin(theta) + y_n*cos(theta))) over element chunks, so a
+        # memory-mapped layout is read slice by slice and no elements x angles matrix is held.
+        steering_vector = np.asarray(steering_vector, dtype=self.complex_dtype).reshape(1, -1)
+        along, across = self._layout_directions(wave_number, angles)
+        array_factor = np.zeros((1, angles.size), dtype=self.complex_dtype)
+        chunk = self._element_chunk_size(angles.size)
+        for start in range(0, len(layout), chunk):
+            elements = slice(start, start + chunk)
+            x, y = layout.slice_positions(elements, self.real_dtype)
+            self.kernel.array_factor(x[None], y[None], steering_vector[:, elements], along, across,
+                                     out=array_factor, accumulate=True, block_bytes=self._block_bytes())
+        return array_factor[0]
+
+    def _calculate_layout_decibels(self, params, steering_vector, angles, out=None):
+        angles = np.asarray(angles, dtype=self.real_dtype).reshape(-1)
+        layout = ArrayModel.load_layout(params.layout)
+        wave_number = self._calculate_wavenumber(params.frequency)
+        if self.kernel.active_backend != 'numba':
+            array_factor = self._accumulate_layout_factor(layout, wave_number, steering_vector, angles)
+            return self.kernel.decibels(array_factor, out)
+        # The compiled kernel holds no elements x angles terms, so the whole layout goes in one pass.
+        x, y = layout.slice_positions(slice(None), self.real_dtype)
+        along, across = self._layout_directions(wave_number, angles)
+        out = np.empty(angles.size, dtype=self.real_dtype) if out is None else out
+        steering_vector = np.asarray(steering_vector, dtype=self.complex_dtype).reshape(1, -1)
+        self.kernel.pattern_decibels(x[None], y[None], steering_vector, along, across, out=out[None])
+        return out
+
+    def _layout_directions(self, wave_number, angles):
+        k = self.real_dtype.type(wave_number)
+        return (k * np.sin(angles))[None], (k * np.cos(angles))[None]
+
+    def _element_chunk_size(self, angle_count):
+        # Phase and exponential terms for one chunk; a floor keeps the Python loop short
+        # when there are many angles, the memory budget stays the hard limit.
+        bytes_per_element = max(angle_count, 1) * (self.real_dtype.itemsize + self.complex_dtype.itemsize)
+        chunk = max(int(self._block_bytes() // bytes_per_element), 64)
+        return max(1, min(chunk, int(self.memory_budget // bytes_per_element)))
+
+    @profiled('model.array_factor')
+    def _calculate_dirichlet_array_factor(self, params, steering_vector, angles):
+        real = self.real_dtype
+        if params.elements <= 0:
+            return np.zeros(np.size(angles), dtype=self.complex_dtype)
+        wave_number = self._calculate_wavenumber(params.frequency)
+        psi = real.type(wave_number * params.spacing) * (np.sin(np.asarray(angles, dtype=real).reshape(-1)) -
+                                                          real.type(np.sin(params.steering)))
+        kernel = self._uniform_linear_strategy.dirichlet_kernel(params.elements, psi)
+        if params.array_type == 'planar':
+            psi_rows = real.type(wave_number * params.spacing) * (np.cos(np.asarray(angles, dtype=real).reshape(-1)) -
+                                                                   real.type(np.cos(params.steering)))
+            kernel *= self._uniform_linear_strategy.dirichlet_kernel(params.rows, psi_rows)
+        return np.asarray(steering_vector).reshape(-1)[0] * kernel
+
+    def _fft_spectrum(self, params, steering_vector):
+        padded_length = self._uniform_linear_strategy.fft_padded_length(params.elements, self.fft_tolerance)
+        return self._uniform_linear_strategy.fft_spectrum(steering_vector, padded_length)
+
+    @profiled('model.array_factor')
+    def _interpolate_spectrum(self, params, spectrum, angles):
+        wave_number = self._calculate_wavenumber(params.frequency)
+        spacing_wavelengths = wave_number * params.spacing / (2 * np.pi)
+        return self._uniform_linear_strategy.interpolate_spectrum(
+            spectrum, self.real_dtype.type(spacing_wavelengths), np.asarray(angles, dtype=self.real_dtype)
+        )
 
     def _calculate_phase(self, phase, use_phase=True):
         return np.deg2rad(phase) if use_phase else 0
     
-    def _setup_interference_grid(self):
-        x = np.linspace(-10, 10, 200)
-        y = np.linspace(-10, 10, 200)
-        X, Y = np.meshgrid(x, y)
-        return {'X': X, 'Y': Y}
-
-    def _normalize_pattern(self, pattern):
-        normalized = 20 * np.log10(np.abs(pattern))
-        normalized = normalized - np.max(normalized)
-        return np.clip(normalized, self.magnitude_min, self.magnitude_max)
\ No newline at end of file
+    def _setup_interference_grid(self, resolution=None):
+        resolution = resolution or self.grid_resolution
+        x = np.linspace(-self.grid_extent, self.grid_extent, resolution)
+        y = np.linspace(-self.grid_extent, self.grid_extent, resolution)
+        return x, y
+
+    def _normalize_pattern(self, pattern, axis=None):
+        return self._normalize_decibels(self.kernel.decibels(pattern), axis)
+
+    @profiled('model.normalize')
+    def _normalize_decibels(self, decibels, axis=None):
+        if decibels.size == 0:
+            return decibels
+        decibels -= np.max(decibels, axis=axis, keepdims=axis is not None)
+        return np.clip(decibels, self.magnitude_min, self.magnitude_max, out=decibels)
\ No newline at end of file
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import numpy as np
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    nbytes: int
+
+
+class LRUCache:
+    def __init__(self, maxsize=128, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = self._freeze(compute())
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        nbytes = self._measure(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self.maxsize, self._nbytes)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+
+    @classmethod
+    def _freeze(cls, value):
+        # Cached arrays are shared between callers, so they are handed out read-only.
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        elif hasattr(value, '__dict__'):
+            for item in vars(value).values():
+                cls._freeze(item)
+        elif isinstance(value, (tuple, list)):
+            for item in value:
+                cls._freeze(item)
+        return value
+
+    @classmethod
+    def _measure(cls, value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if hasattr(value, '__dict__'):
+            return sum(cls._measure(item) for item in vars(value).values())
+        if isinstance(value, (tuple, list)):
+            return sum(cls._measure(item) for item in value)
+        return 0
+
+
+def array_key(values):
+    values = np.ascontiguousarray(values)
+    return (values.shape, str(values.dtype), hash(values.tobytes()))
@@ -0,0 +1,8 @@
+class ComputationCancelled(Exception):
+    pass
+
+
+def check_cancelled(cancelled):
+    # Long loops call this between tiles; cancelled is a callable such as threading.Event.is_set.
+    if cancelled is not None and cancelled():
+        raise ComputationCancelled()
@@ -0,0 +1,63 @@
+import numpy as np
+
+class UniformLinearStrategy:
+    # A uniform linear array's factor is a polynomial in z = exp(j*2*pi*u) with
+    # u = d*sin(theta)/wavelength, so it can be sampled with an FFT over u in [0, 1).
+
+    @staticmethod
+    def fft_error_bound(elements, padded_length):
+        # Linear interpolation between FFT samples spaced h = 1/P apart errs by at most
+        # h**2/8 * max|AF''|, and |AF''| <= (2*pi)**2 * sum(n**2) for unit-modulus weights.
+        # The bound is relative to the ideal peak |AF| = elements.
+        if elements <= 1:
+            return 0.0
+        second_moment = (elements - 1) * elements * (2 * elements - 1) / 6
+        return (np.pi**2 / 2) * second_moment / (padded_length**2 * elements)
+
+    @staticmethod
+    def fft_padded_length(elements, tolerance):
+        elements = max(int(elements), 1)
+        second_moment = (elements - 1) * elements * (2 * elements - 1) / 6
+        required = np.sqrt((np.pi**2 / 2) * second_moment / (elements * tolerance))
+        return int(2**np.ceil(np.log2(max(required, elements, 2))))
+
+    @staticmethod
+    def fft_spectrum(steering_vector, padded_length):
+        steering_vector = np.asarray(steering_vector).reshape(-1)
+        spectrum = padded_length * np.fft.ifft(steering_vector, padded_length)
+        return spectrum.astype(np.result_type(steering_vector, np.complex64), copy=False)
+
+    @staticmethod
+    def interpolate_spectrum(spectrum, spacing_wavelengths, angles):
+        padded_length = spectrum.size
+        position = np.mod(spacing_wavelengths * np.sin(angles), 1.0)
+        position *= padded_length
+        floor = np.floor(position)
+        fraction = position - floor
+        index = floor.astype(np.intp)
+        index %= padded_length
+        lower = spectrum[index]
+        upper = spectrum[(index + 1) % padded_length]
+        return lower + fraction * (upper - lower)
+
+    @staticmethod
+    def dirichlet_kernel(elements, psi):
+        # sum(exp(j*n*psi), n < N) = exp(j*(N-1)*psi/2) * sin(N*psi/2) / sin(psi/2).
+        # The ratio is evaluated around the nearest multiple of pi so the removable
+        # singularity at psi = 2*pi*m uses its limit N*(-1)**(m*(N-1)) instead of 0/0.
+        # Float32 psi stays float32 (single-precision mode); anything else is computed in float64.
+        psi = np.asarray(psi)
+        half = psi.astype(np.float32 if psi.dtype == np.float32 else float) / 2
+        elements = np.asarray(elements, dtype=half.dtype)
+        turns = np.round(half / np.pi)
+        offset = half - turns * np.pi
+        sign = 1 - 2 * np.mod(turns * (elements - 1), 2)
+
+        near_peak = np.abs(elements * offset) < 1e-3
+        safe_offset = np.where(near_peak, 1.0, offset)
+        ratio = np.where(
+            near_peak,
+            elements * (1 - (elements**2 - 1) * offset**2 / 6),
+            np.sin(elements * safe_offset) / np.sin(safe_offset)
+        )
+        return np.exp(1j * (elements - 1) * half) * sign * ratio
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import os
+import numpy as np
+from model.cancellation import check_cancelled
+
+# Working-set size of one tile; each worker thread holds one tile at a time.
+_TILE_BYTES = 2**20
+_ELEMENT_CHUNK = 256
+
+@dataclass
+class FieldSources:
+    x: np.ndarray
+    y: np.ndarray
+    weights: np.ndarray
+    wave_number: np.ndarray
+
+    def __post_init__(self):
+        real = np.float32 if np.asarray(self.x).dtype == np.float32 else float
+        self.x = np.asarray(self.x, dtype=real).reshape(-1)
+        self.y = np.asarray(self.y, dtype=real).reshape(-1)
+        self.weights = np.asarray(self.weights, dtype=np.result_type(real, np.complex64)).reshape(-1)
+        self.wave_number = np.broadcast_to(np.asarray(self.wave_number, dtype=real), self.x.shape)
+
+    @classmethod
+    def concatenate(cls, sources):
+        sources = list(sources)
+        if not sources:
+            return cls(x=np.array([]), y=np.array([]), weights=np.array([]), wave_number=np.array([]))
+        return cls(
+            x=np.concatenate([source.x for source in sources]),
+            y=np.concatenate([source.y for source in sources]),
+            weights=np.concatenate([source.weights for source in sources]),
+            wave_number=np.concatenate([source.wave_number for source in sources])
+        )
+
+    def __len__(self):
+        return self.x.size
+
+    def astype(self, dtype):
+        real = np.finfo(dtype).dtype
+        return FieldSources(x=self.x.astype(real), y=self.y.astype(real),
+                            weights=self.weights.astype(dtype), wave_number=self.wave_number.astype(real))
+
+
+class FieldSolver:
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.memory_budget = 64 * 2**20
+        self.dtype = np.dtype(complex)
+        self._executor = None
+
+    def calculate_field(self, sources, x, y):
+        real = np.finfo(self.dtype).dtype
+        x = np.asarray(x, dtype=real)
+        y = np.asarray(y, dtype=real)
+        grid_x = np.broadcast_to(x, (y.size, x.size)).reshape(-1)
+        grid_y = np.broadcast_to(y[:, None], (y.size, x.size)).reshape(-1)
+        field = self.calculate_field_points(sources, grid_x, grid_y, self.minimum_distance(x, y))
+        return field.reshape(y.size, x.size)
+
+    def calculate_field_points(self, sources, x, y, min_distance=1e-3, cancelled=None):
+        # Field at arbitrary points, e.g. only the visible pixels of a grid; distances are
+        # clamped to min_distance so a point on top of an element stays finite.
+        real = np.finfo(self.dtype).dtype
+        x = np.asarray(x, dtype=real).reshape(-1)
+        y = np.asarray(y, dtype=real).reshape(-1)
+        sources = sources.astype(self.dtype)
+        field = np.zeros(x.size, dtype=self.dtype)
+        if len(sources) == 0 or field.size == 0:
+            return field
+
+        tiles = list(self._point_tiles(x.size, len(sources)))
+        def solve(points):
+            check_cancelled(cancelled)
+            self._solve_tile(sources, x, y, points, real.type(min_distance), field)
+
+        if len(tiles) == 1 or self.workers <= 1:
+            for points in tiles:
+                solve(points)
+        else:
+            list(self._get_executor().map(solve, tiles))
+        return field
+
+    def minimum_distance(self, x, y):
+        steps = [np.abs(np.diff(axis)).min() for axis in (np.asarray(x), np.asarray(y)) if axis.size > 1]
+        return min(steps) / 2 if steps else 1e-3
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _point_tiles(self, point_count, source_count):
+        # Temporaries per element-point pair: distance, phase and the complex exponential.
+        bytes_per_point = min(source_count, _ELEMENT_CHUNK) * self.dtype.itemsize * 5 // 2
+        tile_bytes = min(_TILE_BYTES, self.memory_budget // self.workers)
+        points_per_tile = max(1, int(tile_bytes // max(bytes_per_point, 1)))
+        for start in range(0, point_count, points_per_tile):
+            yield slice(start, min(start + points_per_tile, point_count))
+
+    def _solve_tile(self, sources, x, y, points, min_distance, field):
+        tile = np.zeros(x[points].size, dtype=field.dtype)
+        for start in range(0, len(sources), _ELEMENT_CHUNK):
+            elements = slice(start, start + _ELEMENT_CHUNK)
+            distance = self._calculate_distance(x[points], y[points], sources.x[elements], sources.y[elements])
+            np.maximum(distance, min_distance, out=distance)
+            # 2D point sources: cylindrical spreading with amplitude 1/sqrt(r).
+            propagation = np.exp(-1j * sources.wave_number[elements, None] * distance)
+            propagation /= np.sqrt(distance, out=distance)
+            tile += sources.weights[elements] @ propagation
+        field[points] = tile
+
+    def _calculate_distance(self, grid_x, grid_y, source_x, source_y):
+        # In-place sqrt(dx*dx + dy*dy) is several times faster than np.hypot here.
+        dx = grid_x - source_x[:, None]
+        dy = grid_y - source_y[:, None]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        return np.sqrt(dx, out=dx)
@@ -0,0 +1,192 @@
+import threading
+from types import SimpleNamespace
+import numpy as np
+
+_BLOCK_BYTES = 2**20
+
+# None until the first kernel call tries to compile; False when Numba is not installed.
+_compiled = None
+
+def _compile():
+    # Numba is optional and slow to import, so it is only loaded when a kernel first runs.
+    global _compiled
+    if _compiled is None:
+        try:
+            _compiled = _compile_numba_kernels()
+        except ImportError:
+            _compiled = False
+    return _compiled or None
+
+
+def _compile_numba_kernels():
+    import numba
+
+    @numba.njit(inline='always')
+    def sum_terms(x, y, excitation, row, u, v):
+        real = 0.0
+        imag = 0.0
+        for element in range(x.shape[1]):
+            phase = x[row, element] * u + y[row, element] * v
+            cosine = np.cos(phase)
+            sine = np.sin(phase)
+            weight = excitation[row, element]
+            real += weight.real * cosine - weight.imag * sine
+            imag += weight.real * sine + weight.imag * cosine
+        return real, imag
+
+    @numba.njit(parallel=True, cache=True)
+    def array_factor(x, y, excitation, along, across, out, accumulate):
+        angles = along.shape[1]
+        for index in numba.prange(x.shape[0] * angles):
+            row, angle = index // angles, index % angles
+            real, imag = sum_terms(x, y, excitation, row, along[row, angle], across[row, angle])
+            if accumulate:
+                out[row, angle] += complex(real, imag)
+            else:
+                out[row, angle] = complex(real, imag)
+
+    @numba.njit(parallel=True, cache=True)
+    def pattern_decibels(x, y, excitation, along, across, out):
+        angles = along.shape[1]
+        for index in numba.prange(x.shape[0] * angles):
+            row, angle = index // angles, index % angles
+            real, imag = sum_terms(x, y, excitation, row, along[row, angle], across[row, angle])
+            out[row, angle] = 10 * np.log10(real * real + imag * imag)
+
+    @numba.njit(parallel=True, cache=True)
+    def shift(array_factor, x, y, along, across):
+        angles = along.shape[0]
+        for index in numba.prange(x.shape[0] * angles):
+            row, angle = index // angles, index % angles
+            phase = x[row] * along[angle] + y[row] * across[angle]
+            array_factor[row, angle] *= complex(np.cos(phase), np.sin(phase))
+
+    return SimpleNamespace(array_factor=array_factor, pattern_decibels=pattern_decibels, shift=shift)
+
+
+class ArrayFactorKernel:
+    # Evaluates AF[r, m] = sum_n w[r, n] * exp(j*(x[r, n]*along[r, m] + y[r, n]*across[r, m]))
+    # and its dB magnitude without per-call temporaries: the NumPy path tiles the angles and
+    # reuses its phase and term buffers across calls, the Numba path (when installed) sums
+    # each angle in registers and writes straight into the output.
+
+    def __init__(self, backend='auto'):
+        self.backend = backend
+        self.allocations = 0
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def active_backend(self):
+        return 'numba' if self._compiled() is not None else 'numpy'
+
+    def info(self):
+        return {
+            'backend': self.active_backend,
+            'allocations': self.allocations,
+            'buffer_bytes': sum(buffer.nbytes for buffer in self._buffers.values())
+        }
+
+    def clear(self):
+        with self._lock:
+            self._buffers.clear()
+
+    def array_factor(self, x, y, excitation, along, across, out=None, accumulate=False, block_bytes=_BLOCK_BYTES):
+        # x, y, excitation are (rows, elements); along, across and out are (rows, angles).
+        if out is None:
+            out = np.empty(along.shape, dtype=np.result_type(excitation, along, np.complex64))
+        excitation = np.asarray(excitation, dtype=out.dtype)
+        compiled = self._compiled()
+        if compiled is not None:
+            compiled.array_factor(x, y, excitation, along, across, out, accumulate)
+            return out
+        with self._lock:
+            self._numpy_array_factor(x, y, excitation, along, across, out, accumulate, block_bytes)
+        return out
+
+    def pattern_decibels(self, x, y, excitation, along, across, out=None, block_bytes=_BLOCK_BYTES):
+        # 20*log10|AF| in one pass over the elements when compiled.
+        if out is None:
+            out = np.empty(along.shape, dtype=along.dtype)
+        complex_dtype = np.result_type(out, np.complex64)
+        compiled = self._compiled()
+        if compiled is not None:
+            compiled.pattern_decibels(x, y, np.asarray(excitation, dtype=complex_dtype), along, across, out)
+            return out
+        with self._lock:
+            factor = self._buffer('factor', out.shape, complex_dtype)
+            self._numpy_array_factor(x, y, np.asarray(excitation, dtype=complex_dtype), along, across,
+                                     factor, False, block_bytes)
+            return self.decibels(factor, out=out)
+
+    def decibels(self, array_factor, out=None):
+        # 20*log10|AF| computed in place in the output: one array instead of three temporaries.
+        array_factor = np.asarray(array_factor)
+        if out is None:
+            out = np.empty(array_factor.shape, dtype=array_factor.real.dtype)
+        np.abs(array_factor, out=out)
+        np.log10(out, out=out)
+        out *= 20
+        return out
+
+    def shift(self, array_factor, x, y, along, across):
+        # array_factor[r, m] *= exp(j*(x[r]*along[m] + y[r]*across[m])), in place.
+        compiled = self._compiled()
+        if compiled is not None:
+            compiled.shift(array_factor, x, y, along, across)
+            return array_factor
+        with self._lock:
+            phase = self._buffer('shift_phase', array_factor.shape, along.dtype)
+            scratch = self._buffer('shift_scratch', array_factor.shape, along.dtype)
+            terms = self._buffer('shift_terms', array_factor.shape, array_factor.dtype)
+            np.multiply(x[:, None], along, out=phase)
+            np.multiply(y[:, None], across, out=scratch)
+            phase += scratch
+            np.cos(phase, out=terms.real)
+            np.sin(phase, out=terms.imag)
+            array_factor *= terms
+        return array_factor
+
+    def _compiled(self):
+        return None if self.backend == 'numpy' else _compile()
+
+    def _numpy_array_factor(self, x, y, excitation, along, across, out, accumulate, block_bytes):
+        rows, elements = x.shape
+        angles = along.shape[1]
+        real, complex_dtype = along.dtype, out.dtype
+        bytes_per_angle = max(rows * elements * (2 * real.itemsize + complex_dtype.itemsize), 1)
+        tile = max(1, min(angles, int(block_bytes // bytes_per_angle)))
+        phase = self._buffer('phase', (rows * elements * tile,), real)
+        scratch = self._buffer('scratch', (rows * elements * tile,), real)
+        terms = self._buffer('terms', (rows * elements * tile,), complex_dtype)
+        partial = self._buffer('partial', (rows * tile,), complex_dtype) if accumulate else None
+
+        for start in range(0, angles, tile):
+            stop = min(start + tile, angles)
+            shape = (rows, elements, stop - start)
+            size = rows * elements * (stop - start)
+            tile_phase = phase[:size].reshape(shape)
+            tile_scratch = scratch[:size].reshape(shape)
+            tile_terms = terms[:size].reshape(shape)
+            np.multiply(x[:, :, None], along[:, None, start:stop], out=tile_phase)
+            np.multiply(y[:, :, None], across[:, None, start:stop], out=tile_scratch)
+            tile_phase += tile_scratch
+            np.cos(tile_phase, out=tile_terms.real)
+            np.sin(tile_phase, out=tile_terms.imag)
+            if accumulate:
+                tile_partial = partial[:rows * (stop - start)].reshape(rows, 1, stop - start)
+                np.matmul(excitation[:, None, :], tile_terms, out=tile_partial)
+                out[:, start:stop] += tile_partial[:, 0]
+            else:
+                np.matmul(excitation[:, None, :], tile_terms, out=out[:, None, start:stop])
+
+    def _buffer(self, name, shape, dtype):
+        # Buffers only grow, so once a frame's largest tile has been seen no further arrays are allocated.
+        key = (name, np.dtype(dtype))
+        size = int(np.prod(shape))
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=dtype)
+            self._buffers[key] = buffer
+            self.allocations += 1
+        return buffer[:size].reshape(shape)
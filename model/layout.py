@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+import itertools
+import os
+import numpy as np
+
+_memory_tokens = itertools.count()
+
+@dataclass
+class ElementLayout:
+    x: np.ndarray
+    y: np.ndarray
+    weights: np.ndarray = None
+    key: tuple = field(default=None, compare=False)
+
+    def __post_init__(self):
+        if self.key is None:
+            # In-memory layouts are identified by a token, file layouts by path and mtime.
+            self.key = ('memory', next(_memory_tokens))
+
+    def __len__(self):
+        return self.x.shape[0]
+
+    @property
+    def is_weighted(self):
+        return self.weights is not None
+
+    @cached_property
+    def bounds(self):
+        if len(self) == 0:
+            return 0.0, 0.0, 0.0, 0.0
+        return float(np.min(self.x)), float(np.max(self.x)), float(np.min(self.y)), float(np.max(self.y))
+
+    @classmethod
+    def load(cls, path):
+        stat = os.stat(path)
+        key = ('file', os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if path.lower().endswith('.npy'):
+            return cls._from_array(np.load(path, mmap_mode='r'), key)
+        return cls._from_csv(path, key)
+
+    @classmethod
+    def _from_array(cls, data, key):
+        # Accepted layouts: (N, 2) x/y, (N, 4) x/y/weight real/imag, complex (N, 3) x/y/weight,
+        # or a structured array with 'x', 'y' and an optional complex 'weight' field.
+        if data.dtype.names:
+            weights = data['weight'] if 'weight' in data.dtype.names else None
+            return cls(x=data['x'], y=data['y'], weights=weights, key=key)
+        if data.ndim != 2 or data.shape[1] not in (2, 3, 4):
+            raise ValueError(f'Layout must have 2, 3 or 4 columns, got shape {data.shape}')
+        if np.iscomplexobj(data):
+            weights = data[:, 2] if data.shape[1] == 3 else None
+            return cls(x=data[:, 0].real, y=data[:, 1].real, weights=weights, key=key)
+        if data.shape[1] == 3:
+            raise ValueError('A real layout needs both weight_real and weight_imag columns')
+        weights = data[:, 2] + 1j * data[:, 3] if data.shape[1] == 4 else None
+        return cls(x=data[:, 0], y=data[:, 1], weights=weights, key=key)
+
+    @classmethod
+    def _from_csv(cls, path, key):
+        # Columns are x, y and optionally weight_real, weight_imag; a header line is skipped.
+        with open(path) as file:
+            first_line = file.readline()
+        try:
+            [float(value) for value in first_line.split(',')]
+            skiprows = 0
+        except ValueError:
+            skiprows = 1
+        data = np.loadtxt(path, delimiter=',', ndmin=2, skiprows=skiprows, comments='#')
+        return cls._from_array(data, key)
+
+    def slice_positions(self, elements, dtype=float):
+        return np.asarray(self.x[elements], dtype=dtype), np.asarray(self.y[elements], dtype=dtype)
+
+    def slice_weights(self, elements, dtype=complex):
+        if self.weights is None:
+            return None
+        return np.asarray(self.weights[elements], dtype=dtype)
@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+import numpy as np
+from model.array_model import ArrayModel, ArrayPositions
+from model.beam_metrics import BeamMetrics
+from model.beamforming_model import BeamformingParameters
+from model.profiling import profiled
+
+# Trials drawn from one child RNG; fixing this makes results independent of the memory budget.
+_TRIAL_BLOCK = 256
+_MAX_SERIES_ORDER = 12
+
+@dataclass
+class ErrorModel:
+    failure_rate: float = 0.0
+    phase_error: float = 0.0
+    amplitude_error: float = 0.0
+    position_error: float = 0.0
+
+
+@dataclass
+class TrialErrors:
+    gain: np.ndarray
+    dx: np.ndarray
+    dy: np.ndarray
+
+    @property
+    def has_jitter(self):
+        return bool(np.any(self.dx) or np.any(self.dy))
+
+
+@dataclass
+class MonteCarloResult:
+    angles: np.ndarray
+    nominal: np.ndarray
+    percentiles: tuple
+    bands: np.ndarray
+    metrics: BeamMetrics
+    trials: int
+
+    def band(self, percentile):
+        return self.bands[self.percentiles.index(percentile)]
+
+    def metric_percentiles(self, name, percentiles=None):
+        values = getattr(self.metrics, name)
+        return np.nanpercentile(values, percentiles or self.percentiles, axis=0)
+
+
+class MonteCarloAnalysis:
+    def __init__(self, model, errors=None, trials=1000, seed=None, percentiles=(5, 50, 95),
+                 floor_db=-100.0, ceiling_db=10.0, bin_width_db=0.05):
+        self.model = model
+        self.errors = errors or ErrorModel()
+        self.trials = trials
+        self.seed = seed
+        self.percentiles = tuple(percentiles)
+        self.floor_db = floor_db
+        self.ceiling_db = ceiling_db
+        self.bin_width_db = bin_width_db
+
+    @profiled('model.monte_carlo')
+    def run(self, params, angles, use_phase=True):
+        params = BeamformingParameters.from_dict(params)
+        angles = np.asarray(angles, dtype=self.model.real_dtype).reshape(-1)
+        steering_vector = np.asarray(self.model.calculate_steering_vector(params, use_phase)).reshape(-1)
+        manifold = np.conj(self.model.calculate_weights(params, angles))
+        nominal_factor = steering_vector @ manifold
+        reference = np.max(np.abs(nominal_factor))
+
+        positions = self._nominal_positions(params)
+        wave_number = self.model.calculate_wavenumbers(np.array([params.frequency]))[0]
+        along, across = self._jitter_directions(params, angles, wave_number)
+
+        # Bands come from per-angle histograms of the trial patterns, so memory stays
+        # fixed however many trials run; metrics keep one value per trial.
+        bins = int(np.ceil((self.ceiling_db - self.floor_db) / self.bin_width_db))
+        counts = np.zeros(angles.size * bins, dtype=np.int64)
+        metrics = []
+        for rng, trial_count in self._trial_generators():
+            trial_errors = self._draw_errors(rng, trial_count, positions)
+            array_factor = self._evaluate_trials(trial_errors, steering_vector, manifold, along, across, reference)
+            decibels = self._to_decibels(array_factor, reference)
+            counts += self._histogram(decibels, bins)
+            metrics.append(self.model.metric_extractor.extract(angles, decibels, params.steering))
+
+        return MonteCarloResult(
+            angles=angles,
+            nominal=self._to_decibels(nominal_factor, reference),
+            percentiles=self.percentiles,
+            bands=self._histogram_percentiles(counts.reshape(angles.size, bins)),
+            metrics=BeamMetrics.concatenate(metrics),
+            trials=self.trials
+        )
+
+    def _nominal_positions(self, params):
+        if params.array_type == 'custom':
+            return ArrayModel().calculate_positions({**vars(params), 'x_position': 0, 'y_position': 0})
+        positions = ArrayModel().calculate_batch_positions(
+            [params.elements], [params.spacing], [params.curvature], [params.array_type != 'curved'],
+            [params.rows if params.array_type == 'planar' else 1]
+        )
+        return ArrayPositions(x=positions.x[0], y=positions.y[0])
+
+    def _jitter_directions(self, params, angles, wave_number):
+        # Phase an element offset (dx, dy) adds to its term of the array factor, in the
+        # same frame as the manifold: linear and planar arrays look along (sin, cos), curved along (cos, sin).
+        if params.array_type != 'curved':
+            return wave_number * np.sin(angles), wave_number * np.cos(angles)
+        return -wave_number * np.cos(angles), -wave_number * np.sin(angles)
+
+    def _trial_generators(self):
+        blocks = -(-self.trials // _TRIAL_BLOCK)
+        children = np.random.SeedSequence(self.seed).spawn(blocks)
+        for block, child in enumerate(children):
+            yield np.random.default_rng(child), min(_TRIAL_BLOCK, self.trials - block * _TRIAL_BLOCK)
+
+    def _draw_errors(self, rng, trial_count, positions):
+        shape = (trial_count, positions.x.size)
+        errors = self.errors
+        alive = rng.random(shape) >= errors.failure_rate
+        amplitude = np.maximum(1 + errors.amplitude_error * rng.standard_normal(shape), 0)
+        phase = np.deg2rad(errors.phase_error) * rng.standard_normal(shape)
+        dx = errors.position_error * rng.standard_normal(shape)
+        dy = errors.position_error * rng.standard_normal(shape)
+        return TrialErrors(gain=alive * amplitude * np.exp(1j * phase), dx=dx, dy=dy)
+
+    def _evaluate_trials(self, trial_errors, steering_vector, manifold, along, across, reference):
+        excitation = (trial_errors.gain * steering_vector).astype(manifold.dtype)
+        if not trial_errors.has_jitter:
+            return excitation @ manifold
+        order = self._series_order(trial_errors, excitation, along, across, reference)
+        if order <= _MAX_SERIES_ORDER:
+            return self._evaluate_jitter_series(trial_errors, excitation, manifold, along, across, order)
+        return self._evaluate_jitter_exact(trial_errors, excitation, manifold, along, across)
+
+    def _series_order(self, trial_errors, excitation, along, across, reference):
+        # The truncated exp(j*phi) series errs by at most |phi|**(P+1)/(P+1)! per element;
+        # P is the smallest order that keeps the array factor error below the dB floor.
+        max_phase = np.max(np.abs(trial_errors.dx) * np.max(np.abs(along)) +
+                           np.abs(trial_errors.dy) * np.max(np.abs(across)))
+        tolerance = 10 ** (self.floor_db / 20) * reference / max(np.max(np.sum(np.abs(excitation), axis=1)), 1e-300)
+        order, remainder = 0, max_phase
+        while remainder > tolerance and order <= _MAX_SERIES_ORDER:
+            order += 1
+            remainder *= max_phase / (order + 1)
+        return order
+
+    def _evaluate_jitter_series(self, trial_errors, excitation, manifold, along, across, order):
+        # exp(j*(dx*a + dy*c)) = sum over p, q of (j*dx)**p/p! * (j*dy)**q/q! * a**p * c**q, so
+        # each (p, q) term is one (trials x elements) @ (elements x angles) product scaled per angle.
+        dtype = manifold.dtype
+        dx = 1j * trial_errors.dx.astype(dtype)
+        dy = 1j * trial_errors.dy.astype(dtype)
+        array_factor = np.zeros((excitation.shape[0], along.size), dtype=dtype)
+        dx_term = excitation
+        for p in range(order + 1):
+            coefficient = dx_term
+            for q in range(order + 1 - p):
+                array_factor += (coefficient @ manifold) * (along**p * across**q)
+                coefficient = coefficient * dy / (q + 1)
+            dx_term = dx_term * dx / (p + 1)
+        return array_factor
+
+    def _evaluate_jitter_exact(self, trial_errors, excitation, manifold, along, across):
+        # Large jitter: evaluate trials x elements x angles directly in angle tiles sized to
+        # the memory budget (phase, its cosine/sine pair and the weighted terms).
+        real = self.model.real_dtype
+        trials, elements = excitation.shape
+        dx, dy = trial_errors.dx.astype(real)[:, :, None], trial_errors.dy.astype(real)[:, :, None]
+        array_factor = np.empty((trials, along.size), dtype=manifold.dtype)
+        bytes_per_angle = trials * elements * (2 * real.itemsize + manifold.itemsize)
+        tile = max(1, int(self.model.memory_budget // bytes_per_angle))
+        for start in range(0, along.size, tile):
+            columns = slice(start, start + tile)
+            phase = dx * along[columns]
+            phase += dy * across[columns]
+            terms = np.empty(phase.shape, dtype=manifold.dtype)
+            np.cos(phase, out=terms.real)
+            np.sin(phase, out=terms.imag)
+            terms *= manifold[:, columns]
+            array_factor[:, columns] = np.matmul(excitation[:, None, :], terms)[:, 0, :]
+        return array_factor
+
+    def _to_decibels(self, array_factor, reference):
+        with np.errstate(divide='ignore'):
+            decibels = 20 * np.log10(np.abs(array_factor) / reference)
+        return np.maximum(decibels, self.floor_db)
+
+    def _histogram(self, decibels, bins):
+        index = ((decibels - self.floor_db) / self.bin_width_db).astype(np.intp)
+        np.clip(index, 0, bins - 1, out=index)
+        index += np.arange(decibels.shape[1]) * bins
+        return np.bincount(index.reshape(-1), minlength=decibels.shape[1] * bins)
+
+    def _histogram_percentiles(self, counts):
+        cumulative = np.cumsum(counts, axis=1)
+        rows = np.arange(counts.shape[0])
+        bands = []
+        for percentile in self.percentiles:
+            target = percentile / 100 * self.trials
+            bin_index = np.argmax(cumulative >= max(target, 1e-9), axis=1)
+            below = np.where(bin_index > 0, cumulative[rows, np.maximum(bin_index - 1, 0)], 0)
+            inside = np.maximum(counts[rows, bin_index], 1)
+            fraction = np.clip((target - below) / inside, 0, 1)
+            bands.append(self.floor_db + (bin_index + fraction) * self.bin_width_db)
+        return np.array(bands)
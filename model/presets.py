@@ -0,0 +1,43 @@
+PRESETS = {
+    '5G Communications': {
+        'elements': 64,
+        'spacing': 0.2,
+        'steering': 0.0,
+        'curvature': 0.0,
+        'frequency': 1000.0,
+        'x_position': 0.0,
+        'y_position': 0.0,
+        'array_type': 'Linear'
+    },
+    'Medical Ultrasound': {
+        'elements': 7,
+        'spacing': 10.0,
+        'steering': 0.0,
+        'curvature': 0.0,
+        'frequency': 10.0,
+        'x_position': 0.0,
+        'y_position': 0.0,
+        'array_type': 'Linear'
+    },
+    'Tumor Ablation': {
+        'elements': 98,
+        'spacing': 0.0,
+        'steering': 0.0,
+        'curvature': 2.1,
+        'frequency': 900.0,
+        'x_position': 0.0,
+        'y_position': 0.0,
+        'array_type': 'Linear'
+    },
+    '5G Panel (32x32)': {
+        'elements': 32,
+        'rows': 32,
+        'spacing': 0.5,
+        'steering': 20.0,
+        'curvature': 0.0,
+        'frequency': 1000.0,
+        'x_position': 0.0,
+        'y_position': 0.0,
+        'array_type': 'Planar'
+    }
+}
@@ -0,0 +1,126 @@
+from collections import defaultdict, deque
+from functools import wraps
+import atexit
+import json
+import os
+import threading
+import time
+import numpy as np
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.record(self._name, self._start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False, window=240, max_events=200_000):
+        self.enabled = enabled
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._events = deque(maxlen=max_events)
+        self._frame_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, start, end):
+        with self._lock:
+            self._samples[name].append(end - start)
+            self._events.append((name, start, end, threading.get_ident()))
+
+    def mark_frame(self):
+        if self.enabled:
+            with self._lock:
+                self._frame_times.append(time.perf_counter())
+
+    def fps(self):
+        with self._lock:
+            frames = list(self._frame_times)
+        if len(frames) < 2 or frames[-1] == frames[0]:
+            return 0.0
+        return (len(frames) - 1) / (frames[-1] - frames[0])
+
+    def percentiles(self, name, quantiles=(50, 90, 99)):
+        with self._lock:
+            samples = np.array(self._samples.get(name, ()))
+        if samples.size == 0:
+            return {quantile: 0.0 for quantile in quantiles}
+        return dict(zip(quantiles, np.percentile(samples, quantiles)))
+
+    def summary(self):
+        with self._lock:
+            names = list(self._samples)
+        report = {}
+        for name in sorted(names):
+            with self._lock:
+                samples = np.array(self._samples[name])
+            p50, p90, p99 = np.percentile(samples, (50, 90, 99))
+            report[name] = {'count': samples.size, 'mean': samples.mean(), 'p50': p50, 'p90': p90, 'p99': p99}
+        return report
+
+    def export_chrome_trace(self, path):
+        with self._lock:
+            events = list(self._events)
+        trace = [{
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': thread
+        } for name, start, end, thread in events]
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._events.clear()
+            self._frame_times.clear()
+
+
+def profiled(name):
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            with profiler.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+profiler = Profiler(enabled=os.environ.get('BEAMFORMING_PROFILE', '') not in ('', '0'))
+
+if os.environ.get('BEAMFORMING_TRACE'):
+    profiler.enabled = True
+    atexit.register(profiler.export_chrome_trace, os.environ['BEAMFORMING_TRACE'])
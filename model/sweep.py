@@ -0,0 +1,217 @@
+from dataclasses import asdict, dataclass, field, fields
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from model.beam_metrics import BeamMetrics
+from model.beamforming_model import BatchParameters
+
+_MANIFEST = 'manifest.json'
+_ANGLES = 'angles.npy'
+_METRIC_NAMES = tuple(metric.name for metric in fields(BeamMetrics))
+
+def _output_file(name):
+    return f'{name}.npy' if name == 'pattern' else f'metric_{name}.npy'
+
+
+def _output_names(manifest):
+    names = ['pattern'] if manifest['store_pattern'] else []
+    return names + list(_METRIC_NAMES if manifest['metrics'] else ())
+
+
+@dataclass
+class SweepGrid:
+    # Steering is in degrees like the GUI and presets; the other axes use model units.
+    steering: list = field(default_factory=lambda: [0.0])
+    frequency: list = field(default_factory=lambda: [300.0])
+    elements: list = field(default_factory=lambda: [16])
+    spacing: list = field(default_factory=lambda: [0.5])
+    curvature: list = field(default_factory=lambda: [1.0])
+    array_type: str = 'linear'
+    rows: int = 1
+    phase: float = 0.0
+
+    AXES = ('steering', 'frequency', 'elements', 'spacing', 'curvature')
+
+    def __post_init__(self):
+        for name in self.AXES:
+            setattr(self, name, np.atleast_1d(np.asarray(getattr(self, name), dtype=float)).tolist())
+
+    @classmethod
+    def from_dict(cls, config):
+        return cls(**{name: config[name] for name in (*cls.AXES, 'array_type', 'rows', 'phase') if name in config})
+
+    def to_dict(self):
+        return asdict(self)
+
+    @property
+    def shape(self):
+        return tuple(len(getattr(self, name)) for name in self.AXES)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def axis_values(self, name):
+        return np.asarray(getattr(self, name))
+
+    def batch(self, start, stop):
+        # Row i of the output is the C-order flattening of the grid index.
+        index = np.unravel_index(np.arange(start, stop), self.shape)
+        values = {name: self.axis_values(name)[axis_index] for name, axis_index in zip(self.AXES, index)}
+        count = stop - start
+        return BatchParameters(
+            elements=values['elements'].astype(int),
+            spacing=values['spacing'],
+            steering=np.deg2rad(values['steering']),
+            curvature=values['curvature'],
+            frequency=values['frequency'],
+            phase=np.full(count, float(self.phase)),
+            x_position=np.zeros(count),
+            y_position=np.zeros(count),
+            is_linear=np.full(count, self.array_type != 'curved'),
+            rows=np.full(count, int(self.rows) if self.array_type == 'planar' else 1)
+        )
+
+
+class SweepResult:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, _MANIFEST)) as file:
+            self.manifest = json.load(file)
+        self.grid = SweepGrid.from_dict(self.manifest['grid'])
+        self.angles = np.load(os.path.join(directory, _ANGLES))
+        self._outputs = {name: np.load(os.path.join(directory, _output_file(name)), mmap_mode='r')
+                         for name in _output_names(self.manifest)}
+
+    @property
+    def pattern(self):
+        # A memory-mapped view shaped (steering, frequency, elements, spacing, curvature, angle);
+        # slicing it reads only the touched pages.
+        if 'pattern' not in self._outputs:
+            raise ValueError(f'{self.directory} was swept without storing patterns')
+        return self._reshape(self._outputs['pattern'])
+
+    @property
+    def metrics(self):
+        if not self.manifest['metrics']:
+            raise ValueError(f'{self.directory} was swept without beam metrics')
+        return BeamMetrics(**{name: self._reshape(self._outputs[name]) for name in _METRIC_NAMES})
+
+    def _reshape(self, values):
+        return values.reshape(*self.grid.shape, *values.shape[1:])
+
+    @property
+    def complete(self):
+        return len(self.manifest['completed']) == self.manifest['chunk_count']
+
+    def completed_rows(self):
+        chunk_size = self.manifest['chunk_size']
+        mask = np.zeros(self.grid.size, dtype=bool)
+        for chunk in self.manifest['completed']:
+            mask[chunk * chunk_size:(chunk + 1) * chunk_size] = True
+        return mask.reshape(self.grid.shape)
+
+    def axis_values(self, name):
+        return self.grid.axis_values(name)
+
+
+class ParameterSweep:
+    def __init__(self, model, grid, angles, directory, chunk_size=None, dtype='float32', use_phase=False,
+                 store_pattern=True, metrics=False):
+        self.model = model
+        self.grid = grid
+        self.angles = np.asarray(angles, dtype=float).reshape(-1)
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.use_phase = use_phase
+        self.store_pattern = store_pattern
+        self.metrics = metrics
+        self.chunk_size = chunk_size or self._default_chunk_size()
+
+    def _default_chunk_size(self):
+        # One chunk's complex array factor stays within the model's memory budget.
+        return max(1, int(self.model.memory_budget // (self.angles.size * 16)))
+
+    @property
+    def chunk_count(self):
+        return -(-self.grid.size // self.chunk_size)
+
+    def run(self, progress=None):
+        manifest, outputs = self._open()
+        completed = set(manifest['completed'])
+        for chunk in range(self.chunk_count):
+            if chunk in completed:
+                continue
+            start = chunk * self.chunk_size
+            stop = min(start + self.chunk_size, self.grid.size)
+            self._write_chunk(outputs, start, stop)
+            # The data must reach the disk before the manifest claims the chunk.
+            for output in outputs.values():
+                output.flush()
+            completed.add(chunk)
+            manifest['completed'] = sorted(completed)
+            self._write_manifest(manifest)
+            if progress is not None:
+                progress(len(completed), self.chunk_count)
+        del outputs
+        return SweepResult(self.directory)
+
+    def _write_chunk(self, outputs, start, stop):
+        batch = self.grid.batch(start, stop)
+        pattern = self.model.calculate_pattern_batch(batch, self.angles, self.use_phase)
+        if self.store_pattern:
+            outputs['pattern'][start:stop] = pattern
+        if self.metrics:
+            metrics = self.model.metric_extractor.extract(self.angles, pattern, batch.steering)
+            for name in _METRIC_NAMES:
+                outputs[name][start:stop] = getattr(metrics, name)
+
+    def _open(self):
+        manifest_path = os.path.join(self.directory, _MANIFEST)
+        expected = {
+            'grid': self.grid.to_dict(),
+            'angle_count': self.angles.size,
+            'dtype': self.dtype.str,
+            'chunk_size': self.chunk_size,
+            'chunk_count': self.chunk_count,
+            'use_phase': self.use_phase,
+            'store_pattern': self.store_pattern,
+            'metrics': self.metrics,
+            'max_nulls': self.model.metric_extractor.max_nulls
+        }
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+            stored = {name: manifest.get(name) for name in expected}
+            stored_angles = np.load(os.path.join(self.directory, _ANGLES))
+            if stored != json.loads(json.dumps(expected)) or not np.array_equal(stored_angles, self.angles):
+                raise ValueError(f'{self.directory} holds a different sweep; choose another directory')
+            return manifest, {name: open_memmap(os.path.join(self.directory, _output_file(name)), mode='r+')
+                              for name in _output_names(manifest)}
+
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(os.path.join(self.directory, _ANGLES), self.angles)
+        manifest = {**expected, 'completed': []}
+        outputs = {name: open_memmap(os.path.join(self.directory, _output_file(name)), mode='w+',
+                                     dtype=dtype, shape=(self.grid.size, *shape))
+                   for name, (dtype, shape) in self._output_layout().items()}
+        self._write_manifest(manifest)
+        return manifest, outputs
+
+    def _output_layout(self):
+        layout = {}
+        if self.store_pattern:
+            layout['pattern'] = (self.dtype, (self.angles.size,))
+        if self.metrics:
+            layout.update({name: (np.float32, ()) for name in _METRIC_NAMES})
+            layout['null_count'] = (np.int32, ())
+            layout['nulls'] = (np.float32, (self.model.metric_extractor.max_nulls,))
+        return layout
+
+    def _write_manifest(self, manifest):
+        path = os.path.join(self.directory, _MANIFEST)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temporary, path)
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+import numpy as np
+
+@dataclass
+class _Scene:
+    total: np.ndarray = None
+    contributions: dict = field(default_factory=dict)
+    signatures: dict = field(default_factory=dict)
+    updates: int = 0
+
+
+class UnitFieldCache:
+    # Keeps each unit's complex contribution to a fixed grid together with the running
+    # total, so editing one unit costs one unit: its old contribution is subtracted and
+    # the new one added. Units missing from a request are evicted the same way.
+
+    def __init__(self, max_scenes=4, rebuild_interval=64):
+        self.max_scenes = max_scenes
+        self.rebuild_interval = rebuild_interval
+        self.computed = 0
+        self._scenes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def total(self, grid_key, units, compute):
+        # units is a list of (unit_id, signature, params); compute(params) returns a unit's
+        # contribution on the grid. The returned total is shared and must not be modified.
+        with self._lock:
+            scene = self._scene(grid_key)
+            self._evict_removed(scene, {unit_id for unit_id, _, _ in units})
+            for unit_id, signature, params in units:
+                if scene.signatures.get(unit_id) == signature:
+                    continue
+                values = compute(params)
+                self.computed += 1
+                self._replace(scene, unit_id, signature, values)
+            if scene.updates >= self.rebuild_interval:
+                self._rebuild(scene)
+            return scene.total
+
+    def clear(self):
+        with self._lock:
+            self._scenes.clear()
+
+    def _scene(self, grid_key):
+        scene = self._scenes.pop(grid_key, None) or _Scene()
+        self._scenes[grid_key] = scene
+        while len(self._scenes) > self.max_scenes:
+            self._scenes.popitem(last=False)
+        return scene
+
+    def _evict_removed(self, scene, unit_ids):
+        for unit_id in [unit_id for unit_id in scene.contributions if unit_id not in unit_ids]:
+            scene.total -= scene.contributions.pop(unit_id)
+            del scene.signatures[unit_id]
+            scene.updates += 1
+
+    def _replace(self, scene, unit_id, signature, values):
+        if scene.total is None:
+            scene.total = np.zeros_like(values)
+        previous = scene.contributions.get(unit_id)
+        if previous is not None:
+            scene.total -= previous
+        scene.total += values
+        scene.contributions[unit_id] = values
+        scene.signatures[unit_id] = signature
+        scene.updates += 1
+
+    def _rebuild(self, scene):
+        # Repeated subtract/add leaves rounding residue; re-summing the stored contributions clears it.
+        scene.total = np.zeros_like(scene.total)
+        for values in scene.contributions.values():
+            scene.total += values
+        scene.updates = 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+
+ANGLES = np.linspace(-np.pi / 2, np.pi / 2, 361)
+
+def make_params(array_type, elements, steering, rows=1):
+    return dict(elements=elements, spacing=0.5, steering=steering, array_type=array_type, curvature=1.5,
+                frequency=300, phase=0, rows=rows)
+
+
+# Mixed element counts force padding and masking inside one chunk of the batch.
+MIXED = [make_params('linear', 4, 0.2), make_params('curved', 31, -0.4), make_params('linear', 16, 0.0),
+         make_params('planar', 5, 0.5, rows=3), make_params('curved', 7, 0.1), make_params('planar', 12, -0.7, rows=2)]
+
+
+@pytest.mark.parametrize('pattern_method', ['auto', 'direct'])
+def test_padded_batch_matches_per_unit_loop(pattern_method):
+    model = BeamformingModel()
+    model.pattern_method = pattern_method
+    batch = model.calculate_pattern_batch(MIXED, ANGLES, False)
+    expected = [model.calculate_pattern(BeamformingParameters.from_dict(params), ANGLES, False) for params in MIXED]
+    np.testing.assert_allclose(batch, expected, atol=1e-6)
+
+
+def test_batch_chunks_match_one_block():
+    model = BeamformingModel()
+    expected = model.calculate_array_factor_batch(MIXED, ANGLES)
+    # A budget below one row puts every configuration in its own chunk.
+    model.memory_budget = 1
+    np.testing.assert_allclose(model.calculate_array_factor_batch(MIXED, ANGLES), expected, atol=1e-9)
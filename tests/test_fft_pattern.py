@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+from model.fast_patterns import UniformLinearStrategy
+
+ANGLES = np.linspace(-np.pi / 2, np.pi / 2, 2001)
+
+def make_params(elements, spacing, steering):
+    return BeamformingParameters(elements=elements, spacing=spacing, steering=steering, array_type='linear',
+                                 curvature=1.0, frequency=300, phase=0)
+
+
+def array_factor(model, params, pattern_method):
+    model.pattern_method = pattern_method
+    return model._calculate_array_factor(params, ANGLES, False)
+
+
+@pytest.mark.parametrize('elements', [2, 16, 128])
+@pytest.mark.parametrize('spacing', [0.25, 0.5, 1.3])
+@pytest.mark.parametrize('steering', [0.0, np.deg2rad(40)])
+def test_fft_pattern_stays_within_error_bound(elements, spacing, steering):
+    model = BeamformingModel()
+    params = make_params(elements, spacing, steering)
+    bound = model.fft_error_bound(params)
+    assert bound <= model.fft_tolerance
+    error = np.abs(array_factor(model, params, 'fft') - array_factor(model, params, 'direct'))
+    assert error.max() / elements <= bound
+
+
+def test_padded_length_meets_tolerance():
+    for elements in (1, 7, 64, 1000):
+        for tolerance in (1e-3, 1e-5, 1e-8):
+            padded_length = UniformLinearStrategy.fft_padded_length(elements, tolerance)
+            assert padded_length >= elements
+            assert UniformLinearStrategy.fft_error_bound(elements, padded_length) <= tolerance
@@ -0,0 +1,40 @@
+import json
+import numpy as np
+from headless import Scenario, load_scenarios, main, render_scenario
+from model.beamforming_model import BeamformingModel
+
+UNIT = dict(elements=8, spacing=0.5, steering=20, array_type='linear', frequency=300)
+
+
+def test_scenario_file_fills_defaults_and_resolves_layouts(tmp_path):
+    np.save(tmp_path / 'ring.npy', np.column_stack((np.cos(np.arange(12)), np.sin(np.arange(12)))))
+    source = tmp_path / 'scene.json'
+    source.write_text(json.dumps({'scenarios': [{'name': 'Two units', 'units': [UNIT, {'layout': 'ring.npy'}]}]}))
+    [scenario] = load_scenarios([str(source)])
+    assert scenario.name == 'Two units' and scenario.slug == 'two_units'
+    first, second = scenario.units
+    assert (first['id'], first['curvature'], first['rows']) == (1, 1.0, 1)
+    assert second['array_type'] == 'custom'
+    assert second['layout'] == str(tmp_path / 'ring.npy')
+
+
+def test_npz_holds_the_frame_with_nan_outside_the_half_disk(tmp_path):
+    scenario = Scenario.from_config('single', UNIT)
+    name, [path] = render_scenario(scenario, str(tmp_path), ['npz'], resolution=64)
+    assert name == 'single'
+    with np.load(path) as data:
+        assert set(data.files) == {'beam_angles', 'beam_pattern', 'interference', 'positions_x_1', 'positions_y_1'}
+        assert data['positions_x_1'].size == UNIT['elements']
+        interference = data['interference']
+    assert interference.shape == (64, 64)
+    visible = BeamformingModel().visible_pixels(64).size
+    assert np.count_nonzero(~np.isnan(interference)) == visible
+
+
+def test_main_reports_failed_scenarios(tmp_path):
+    source = tmp_path / 'broken.json'
+    source.write_text(json.dumps({'units': [{'layout': 'missing.npy'}]}))
+    output = tmp_path / 'out'
+    assert main(['5G Communications', str(source), '-o', str(output), '-f', 'npz', '-j', '1',
+                 '--resolution', '32']) == 1
+    assert [path.name for path in output.iterdir()] == ['5g_communications.npz']
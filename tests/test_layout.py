@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel
+from model.layout import ElementLayout
+
+X = np.arange(16) * 0.5
+Y = np.zeros(16)
+WEIGHTS = np.hanning(18)[1:-1] * np.exp(0.3j * np.arange(16))
+ANGLES = np.linspace(-np.pi / 2, np.pi / 2, 361)
+
+
+def write_layouts(directory):
+    structured = np.zeros(16, dtype=[('x', float), ('y', float), ('weight', complex)])
+    structured['x'], structured['y'], structured['weight'] = X, Y, WEIGHTS
+    arrays = {
+        'positions.npy': np.column_stack((X, Y)),
+        'weighted.npy': np.column_stack((X, Y, WEIGHTS.real, WEIGHTS.imag)),
+        'complex.npy': np.column_stack((X, Y, WEIGHTS)),
+        'structured.npy': structured
+    }
+    for name, data in arrays.items():
+        np.save(directory / name, data)
+    np.savetxt(directory / 'positions.csv', np.column_stack((X, Y)), delimiter=',')
+    np.savetxt(directory / 'weighted.csv', np.column_stack((X, Y, WEIGHTS.real, WEIGHTS.imag)), delimiter=',',
+               header='x,y,weight_real,weight_imag', comments='')
+    return directory
+
+
+@pytest.mark.parametrize('name', ['positions.npy', 'weighted.npy', 'complex.npy', 'structured.npy',
+                                  'positions.csv', 'weighted.csv'])
+def test_layout_files_round_trip(tmp_path, name):
+    layout = ElementLayout.load(str(write_layouts(tmp_path) / name))
+    assert len(layout) == 16
+    np.testing.assert_allclose(layout.x, X)
+    np.testing.assert_allclose(layout.y, Y)
+    if name.startswith('positions'):
+        assert not layout.is_weighted
+    else:
+        np.testing.assert_allclose(layout.weights, WEIGHTS)
+    assert layout.bounds == (0.0, 7.5, 0.0, 0.0)
+
+
+def test_npy_layouts_are_memory_mapped(tmp_path):
+    layout = ElementLayout.load(str(write_layouts(tmp_path) / 'weighted.npy'))
+    assert isinstance(layout.x, np.memmap)
+
+
+def test_bad_layout_shape_is_rejected(tmp_path):
+    np.save(tmp_path / 'bad.npy', np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        ElementLayout.load(str(tmp_path / 'bad.npy'))
+
+
+@pytest.mark.parametrize('chunk_budget', [None, 1])
+def test_custom_pattern_matches_weighted_element_sum(tmp_path, chunk_budget):
+    model = BeamformingModel()
+    if chunk_budget:
+        model.memory_budget = chunk_budget
+    path = str(write_layouts(tmp_path) / 'weighted.csv')
+    steering = np.deg2rad(25)
+    params = dict(elements=0, spacing=0.5, steering=steering, array_type='custom', curvature=1.0,
+                  frequency=300, phase=0, layout=path)
+    k = 2 * np.pi * 300e6 / model.speed_of_light
+    excitation = WEIGHTS * np.exp(-1j * k * X * np.sin(steering))
+    expected = np.abs(excitation @ np.exp(1j * k * np.outer(X, np.sin(ANGLES))))
+    expected = 20 * np.log10(expected / expected.max())
+    pattern = model.calculate_pattern_batch([params], ANGLES, False)[0]
+    visible = expected > model.magnitude_min
+    np.testing.assert_allclose(pattern[visible], expected[visible], atol=1e-6)
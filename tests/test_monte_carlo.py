@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+from model.monte_carlo import ErrorModel, MonteCarloAnalysis, TrialErrors
+
+ANGLES = np.linspace(-np.pi / 2, np.pi / 2, 181)
+
+def make_params(array_type):
+    return BeamformingParameters(elements=12, spacing=0.5, steering=0.4, array_type=array_type, curvature=1.5,
+                                 frequency=300, phase=0, rows=2)
+
+
+def jitter_inputs(analysis, params, trials=20, position_error=0.01):
+    model = analysis.model
+    steering_vector = model.calculate_steering_vector(params, True).reshape(-1)
+    manifold = np.conj(model.calculate_weights(params, ANGLES))
+    wave_number = model.calculate_wavenumbers([params.frequency])[0]
+    along, across = analysis._jitter_directions(params, ANGLES, wave_number)
+    rng = np.random.default_rng(0)
+    shape = (trials, steering_vector.size)
+    trial_errors = TrialErrors(gain=np.ones(shape), dx=position_error * rng.standard_normal(shape),
+                               dy=position_error * rng.standard_normal(shape))
+    excitation = (trial_errors.gain * steering_vector).astype(manifold.dtype)
+    reference = np.max(np.abs(steering_vector @ manifold))
+    return trial_errors, excitation, manifold, along, across, reference
+
+
+@pytest.mark.parametrize('array_type', ['linear', 'planar', 'curved'])
+def test_error_free_bands_equal_the_nominal_pattern(array_type):
+    analysis = MonteCarloAnalysis(BeamformingModel(), trials=300, seed=1, bin_width_db=0.01)
+    result = analysis.run(make_params(array_type), ANGLES)
+    assert result.nominal.max() == pytest.approx(0.0)
+    for percentile in result.percentiles:
+        np.testing.assert_allclose(result.band(percentile), result.nominal, atol=0.01)
+
+
+@pytest.mark.parametrize('array_type', ['linear', 'planar', 'curved'])
+def test_jitter_series_matches_exact_evaluation(array_type):
+    analysis = MonteCarloAnalysis(BeamformingModel())
+    trial_errors, excitation, manifold, along, across, reference = jitter_inputs(analysis, make_params(array_type))
+    order = analysis._series_order(trial_errors, excitation, along, across, reference)
+    assert 0 < order <= 12
+    series = analysis._evaluate_jitter_series(trial_errors, excitation, manifold, along, across, order)
+    exact = analysis._evaluate_jitter_exact(trial_errors, excitation, manifold, along, across)
+    np.testing.assert_allclose(series, exact, atol=10 ** (analysis.floor_db / 20) * reference)
+
+
+def test_exact_jitter_matches_moved_elements():
+    analysis = MonteCarloAnalysis(BeamformingModel())
+    params = make_params('linear')
+    trial_errors, excitation, manifold, along, across, _ = jitter_inputs(analysis, params, position_error=0.3)
+    positions = analysis._nominal_positions(params)
+    wave_number = analysis.model.calculate_wavenumbers([params.frequency])[0]
+    x = positions.x + trial_errors.dx
+    y = positions.y + trial_errors.dy
+    phase = wave_number * (x[:, :, None] * np.sin(ANGLES) + y[:, :, None] * np.cos(ANGLES))
+    expected = np.einsum('tn,tnm->tm', excitation, np.exp(1j * phase))
+    exact = analysis._evaluate_jitter_exact(trial_errors, excitation, manifold, along, across)
+    np.testing.assert_allclose(exact, expected, atol=1e-9)
+
+
+def test_seeded_runs_are_reproducible():
+    errors = ErrorModel(failure_rate=0.1, phase_error=5, amplitude_error=0.05, position_error=0.02)
+    first, second = (MonteCarloAnalysis(BeamformingModel(), errors, trials=600, seed=7)
+                     .run(make_params('linear'), ANGLES) for _ in range(2))
+    np.testing.assert_array_equal(first.bands, second.bands)
+    np.testing.assert_array_equal(first.metrics.sidelobe_level, second.metrics.sidelobe_level)
+    assert first.metrics.sidelobe_level.shape == (600,)
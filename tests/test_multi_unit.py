@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel
+
+OFFSETS = ((0, 0), (2.3, 1.7), (-4.1, 0.6))
+
+def make_units(array_type, steering):
+    return [dict(elements=16, spacing=0.5, steering=steering, array_type=array_type, curvature=2.0,
+                 frequency=300, phase=0, rows=2, x_position=x, y_position=y) for x, y in OFFSETS]
+
+
+@pytest.mark.parametrize('pattern_method', ['auto', 'direct'])
+@pytest.mark.parametrize('array_type', ['linear', 'planar', 'curved'])
+@pytest.mark.parametrize('steering', [0.0, np.deg2rad(30)])
+def test_identical_units_add_coherently_at_steering(array_type, steering, pattern_method):
+    model = BeamformingModel()
+    model.pattern_method = pattern_method
+    units = make_units(array_type, steering)
+    elements = 16 * (2 if array_type == 'planar' else 1)
+    array_factor = model.calculate_multi_unit_array_factor(units, [steering])
+    assert np.abs(array_factor[0]) == pytest.approx(len(units) * elements)
+
+
+def test_multi_unit_matches_element_sum_at_absolute_positions():
+    model = BeamformingModel()
+    steering = np.deg2rad(30)
+    units = make_units('linear', steering)
+    k = 2 * np.pi * 300e6 / model.speed_of_light
+    x = np.concatenate([np.arange(16) * 0.5 + x_offset for x_offset, _ in OFFSETS])
+    y = np.concatenate([np.full(16, float(y_offset)) for _, y_offset in OFFSETS])
+    angles = np.linspace(-np.pi / 2, np.pi / 2, 501)
+    weights = np.exp(-1j * k * (x * np.sin(steering) + y * np.cos(steering)))
+    expected = weights @ np.exp(1j * k * (np.outer(x, np.sin(angles)) + np.outer(y, np.cos(angles))))
+    array_factor = model.calculate_multi_unit_array_factor(units, angles)
+    np.testing.assert_allclose(np.abs(array_factor), np.abs(expected), atol=1e-9)
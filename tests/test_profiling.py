@@ -0,0 +1,57 @@
+import json
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel
+from model.profiling import Profiler, profiler
+
+PARAMS = dict(elements=16, spacing=0.5, steering=0.3, array_type='linear', curvature=1.0,
+              frequency=300, phase=0)
+
+
+@pytest.fixture
+def enabled_profiler():
+    enabled = profiler.enabled
+    profiler.reset()
+    profiler.enabled = True
+    yield profiler
+    profiler.enabled = enabled
+    profiler.reset()
+
+
+def test_disabled_profiler_records_nothing():
+    local = Profiler()
+    with local.stage('model.pattern'):
+        pass
+    local.mark_frame()
+    assert local.summary() == {}
+    assert local.fps() == 0.0
+
+
+def test_stages_are_summarized():
+    local = Profiler(enabled=True)
+    for _ in range(5):
+        with local.stage('render.draw'):
+            pass
+    summary = local.summary()
+    assert summary['render.draw']['count'] == 5
+    assert 0 <= summary['render.draw']['p50'] <= summary['render.draw']['p99']
+    assert set(local.percentiles('render.draw')) == {50, 90, 99}
+
+
+def test_profiled_model_calls_are_recorded(enabled_profiler):
+    model = BeamformingModel()
+    model.calculate_multi_unit_array_factor([PARAMS], np.linspace(-1, 1, 11))
+    assert enabled_profiler.summary()['model.multi_unit']['count'] == 1
+
+
+def test_chrome_trace_export(tmp_path):
+    local = Profiler(enabled=True)
+    with local.stage('model.interference'):
+        pass
+    path = local.export_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(path) as file:
+        events = json.load(file)['traceEvents']
+    assert [(event['name'], event['cat'], event['ph']) for event in events] == [
+        ('model.interference', 'model', 'X')
+    ]
+    assert events[0]['dur'] >= 0
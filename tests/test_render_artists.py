@@ -0,0 +1,47 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from controller.array_geometry_controller import ArrayGeometryController
+from controller.beam_pattern_controller import BeamPatternController
+from controller.interference_controller import InterferenceController
+
+def make_units(steering, elements=400):
+    return [dict(id=1, elements=elements, spacing=0.5, steering=steering, array_type='curved', curvature=1.0,
+                 frequency=300, phase=0, rows=1, x_position=0, y_position=0)]
+
+
+def test_beam_update_reuses_its_line():
+    controller = BeamPatternController()
+    ax = Figure().add_subplot()
+    assert controller.update_rectangular_beam(ax, make_units(0))
+    line = ax.lines[-1]
+    assert line.get_animated()
+    assert not controller.update_rectangular_beam(ax, make_units(20))
+    assert list(ax.lines) == [line]
+    angles, pattern = controller.calculate_beam_pattern(make_units(20))
+    np.testing.assert_array_equal(line.get_ydata(), pattern)
+    np.testing.assert_allclose(line.get_xdata(), np.rad2deg(angles))
+
+
+def test_interference_update_reuses_its_image():
+    controller = InterferenceController()
+    controller.model.grid_resolution = 60
+    ax = Figure().add_subplot()
+    assert controller.update_interference(ax, make_units(0, elements=8))
+    image = ax.images[-1]
+    assert not controller.update_interference(ax, make_units(30, elements=8))
+    assert list(ax.images) == [image]
+    expected = controller.calculate_interference(make_units(30, elements=8))
+    np.testing.assert_array_equal(np.ma.getdata(image.get_array()), np.ma.getdata(expected))
+
+
+def test_geometry_update_moves_points_and_resizes_markers():
+    controller = ArrayGeometryController()
+    ax = Figure().add_subplot()
+    assert controller.update_array_geometry(ax, make_units(0, elements=600))
+    scatter = ax.collections[0]
+    assert not controller.update_array_geometry(ax, make_units(0, elements=1000))
+    assert ax.collections[0] is scatter
+    assert scatter.get_offsets().shape[0] == 1000
+    assert scatter.get_sizes()[0] == controller._marker_size(1000)
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(statement):
+    code = f'{statement}\nimport sys\nprint(" ".join(sys.modules))'
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(output.stdout.split())
+
+
+@pytest.mark.parametrize('statement', [
+    'import model.beamforming_model',
+    'import model.sweep, model.monte_carlo',
+    'import controller.visualization_controller',
+])
+def test_model_layer_does_not_load_plotting_or_qt(statement):
+    modules = loaded_modules(statement)
+    assert not {'matplotlib', 'PyQt5', 'numba'} & modules
+
+
+def test_headless_npz_worker_does_not_load_plotting(tmp_path):
+    statement = ('from headless import Scenario, render_scenario\n'
+                 f'render_scenario(Scenario.from_config("unit", {{}}), {str(tmp_path)!r}, ["npz"], resolution=32)')
+    assert 'matplotlib' not in loaded_modules(statement)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel
+from model.sweep import ParameterSweep, SweepGrid, SweepResult
+
+ANGLES = np.linspace(-np.pi / 2, np.pi / 2, 91)
+GRID = SweepGrid(steering=[-30, 0, 30], frequency=[300, 600], elements=[8, 16])
+
+
+class Interrupted(Exception):
+    pass
+
+
+class CountingModel(BeamformingModel):
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def calculate_pattern_batch(self, params_list, angles, use_phase):
+        self.rows.append(len(params_list))
+        return super().calculate_pattern_batch(params_list, angles, use_phase)
+
+
+def interrupt_after(chunks):
+    def progress(done, total):
+        if done == chunks:
+            raise Interrupted
+    return progress
+
+
+def test_resumed_sweep_skips_completed_chunks(tmp_path):
+    directory = str(tmp_path / 'sweep')
+    with pytest.raises(Interrupted):
+        ParameterSweep(BeamformingModel(), GRID, ANGLES, directory, chunk_size=5).run(interrupt_after(2))
+    partial = SweepResult(directory)
+    assert partial.manifest['completed'] == [0, 1] and not partial.complete
+    assert partial.completed_rows().sum() == 10
+
+    model = CountingModel()
+    result = ParameterSweep(model, GRID, ANGLES, directory, chunk_size=5).run()
+    assert model.rows == [2]
+    assert result.complete
+
+    fresh = ParameterSweep(BeamformingModel(), GRID, ANGLES, str(tmp_path / 'fresh'), chunk_size=5).run()
+    np.testing.assert_array_equal(result.pattern, fresh.pattern)
+
+
+def test_pattern_is_shaped_by_the_grid_axes(tmp_path):
+    model = BeamformingModel()
+    result = ParameterSweep(model, GRID, ANGLES, str(tmp_path), metrics=True).run()
+    assert result.pattern.shape == (3, 2, 2, 1, 1, ANGLES.size)
+    params = dict(elements=16, spacing=0.5, steering=np.deg2rad(30), array_type='linear', curvature=1.0,
+                  frequency=600, phase=0)
+    expected = model.calculate_pattern_batch([params], ANGLES, False)[0]
+    np.testing.assert_allclose(result.pattern[2, 1, 1, 0, 0], expected, atol=1e-4)
+    assert result.metrics.peak_angle.shape == GRID.shape
+
+
+def test_different_sweep_in_the_same_directory_is_rejected(tmp_path):
+    ParameterSweep(BeamformingModel(), GRID, ANGLES, str(tmp_path)).run()
+    with pytest.raises(ValueError):
+        ParameterSweep(BeamformingModel(), SweepGrid(steering=[10]), ANGLES, str(tmp_path)).run()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from model.beamforming_model import BeamformingModel, BeamformingParameters
+
+RESOLUTION = 64
+
+def make_params(array_type, x_position=0.0):
+    return dict(elements=12, spacing=0.5, steering=0.3, array_type=array_type, curvature=1.5, frequency=300,
+                phase=0, rows=3, x_position=x_position, y_position=0.0)
+
+
+def grid_angles(model):
+    visible = model.visible_pixels(RESOLUTION)
+    x = np.linspace(-model.grid_extent, model.grid_extent, RESOLUTION)
+    return visible, np.arctan2(x[visible // RESOLUTION], x[visible % RESOLUTION])
+
+
+def test_visible_mask_is_the_upper_half_disk():
+    model = BeamformingModel()
+    mask = model.visible_mask(RESOLUTION)
+    assert mask.shape == (RESOLUTION, RESOLUTION)
+    assert mask.sum() == pytest.approx(np.pi * (RESOLUTION / 2)**2 / 2, rel=0.05)
+    np.testing.assert_array_equal(np.flatnonzero(mask), model.visible_pixels(RESOLUTION))
+
+
+@pytest.mark.parametrize('array_type', ['linear', 'planar', 'curved'])
+@pytest.mark.parametrize('memory_budget', [None, 4096])
+def test_interference_matches_pattern_at_visible_pixels(array_type, memory_budget):
+    model = BeamformingModel()
+    if memory_budget:
+        model.memory_budget = memory_budget
+    params = make_params(array_type)
+    image = model.calculate_interference_pattern([params], RESOLUTION)
+    visible, angles = grid_angles(model)
+    hidden = np.ones(image.size, dtype=bool)
+    hidden[visible] = False
+    assert np.all(image.reshape(-1)[hidden] == model.magnitude_min)
+    expected = model.calculate_pattern(BeamformingParameters.from_dict(params), angles, False)
+    np.testing.assert_allclose(image.reshape(-1)[visible], expected, atol=1e-6)
+
+
+def test_multi_unit_interference_matches_coherent_sum():
+    model = BeamformingModel()
+    units = [make_params('linear'), make_params('curved', x_position=3.0)]
+    image = model.calculate_interference_pattern(units, RESOLUTION)
+    visible, angles = grid_angles(model)
+    expected = model.calculate_multi_unit_pattern(units, angles, False)
+    np.testing.assert_allclose(image.reshape(-1)[visible], expected, atol=1e-6)
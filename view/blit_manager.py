@@ -0,0 +1,36 @@
+from model.profiling import profiler
+
+class BlitManager:
+    def __init__(self, canvas, name='canvas'):
+        self.canvas = canvas
+        self.name = name
+        self._background = None
+        self._draw_connection = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def update(self, redraw_background=False):
+        if redraw_background or self._background is None:
+            # A full draw re-renders the static parts; _on_draw then captures them
+            # and paints the animated artists on top.
+            with profiler.stage(f'render.draw.{self.name}'):
+                self.canvas.draw()
+            return
+        with profiler.stage(f'render.blit.{self.name}'):
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.canvas.figure.bbox)
+
+    def invalidate(self):
+        self._background = None
+
+    def _on_draw(self, event):
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for ax in figure.get_axes():
+            for artist in ax.get_children():
+                if artist.get_animated() and artist.get_visible():
+                    figure.draw_artist(artist)
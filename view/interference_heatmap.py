@@ -0,0 +1,79 @@
+import numpy as np
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QWidget
+from model.profiling import profiler
+
+class InterferenceHeatmap(QWidget):
+    # Interference panel drawn without matplotlib: the controller maps dB to RGBA through a
+    # lookup table and the buffer is wrapped in a QImage; title, labels and colorbar are
+    # painted into a cached pixmap that is only rebuilt when the widget is resized.
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.background = QColor('#111827')
+        self._rgba = None
+        self._image = None
+        self._decorations = None
+        self.setMinimumSize(200, 200)
+
+    def set_pattern(self, masked_pattern):
+        with profiler.stage('render.draw.interference'):
+            self._rgba = self.controller.heatmap_rgba(masked_pattern, out=self._rgba)
+            height, width = self._rgba.shape[:2]
+            # The QImage shares the RGBA buffer; self._rgba keeps it alive until the next frame.
+            self._image = QImage(self._rgba.data, width, height, width * 4, QImage.Format_RGBA8888)
+            self.update()
+
+    def resizeEvent(self, event):
+        self._decorations = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._decorations is None:
+            self._decorations = self._draw_decorations()
+        painter.drawPixmap(0, 0, self._decorations)
+        if self._image is not None:
+            painter.drawImage(self._map_rect(), self._image)
+        painter.end()
+
+    def _map_rect(self):
+        side = max(min(self.width() * 0.8, self.height() * 0.8), 1)
+        return QRectF(self.width() * 0.05, self.height() * 0.12, side, side)
+
+    def _draw_decorations(self):
+        pixmap = QPixmap(self.size())
+        pixmap.fill(self.background)
+        painter = QPainter(pixmap)
+        painter.setPen(QColor('white'))
+        map_rect = self._map_rect()
+
+        painter.setFont(QFont(self.font().family(), 11))
+        painter.drawText(QRectF(map_rect.left(), 0, map_rect.width(), map_rect.top()),
+                         Qt.AlignCenter, 'Interference Map')
+
+        painter.setFont(QFont(self.font().family(), 7))
+        extent = self.controller.model.grid_extent
+        for (x, y), text in (((8, 10.5), 'Constructive\nInterference'), ((8, -9.7), 'Destructive\nInterference')):
+            left = map_rect.left() + (x + extent) / (2 * extent) * map_rect.width()
+            top = map_rect.top() + (extent - y) / (2 * extent) * map_rect.height()
+            painter.drawText(QRectF(left, top - 24, self.width() - left, 30), Qt.AlignLeft | Qt.AlignBottom, text)
+
+        self._draw_colorbar(painter, map_rect)
+        painter.end()
+        return pixmap
+
+    def _draw_colorbar(self, painter, map_rect):
+        colors = self.controller.heatmap_lut()[-2::-1].copy()
+        gradient = QImage(colors.data, 1, colors.shape[0], 4, QImage.Format_RGBA8888)
+        bar = QRectF(map_rect.right() + 0.04 * self.width(), map_rect.top(),
+                     0.03 * self.width(), map_rect.height())
+        painter.drawImage(bar, gradient)
+
+        minimum, maximum = self.controller.magnitude_min, self.controller.magnitude_max
+        for value in np.linspace(minimum, maximum, 7):
+            y = bar.bottom() - (value - minimum) / (maximum - minimum) * bar.height()
+            painter.drawText(QRectF(bar.right() + 3, y - 8, 40, 16), Qt.AlignLeft | Qt.AlignVCenter, f'{value:.0f}')
+        painter.drawText(QRectF(bar.left(), bar.top() - 18, 40, 16), Qt.AlignLeft | Qt.AlignVCenter, 'dB')
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from controller.visualization_controller import VisualizationController
 from .visualization_panel import VisualizationPanel
 from .parameter_panel import ParameterPanel
+from .render_scheduler import RenderScheduler
 
 @dataclass
 class SimulationParameters:
@@ -15,6 +16,8 @@ class SimulationParameters:
     x_position: float
     y_position: float
     phase: float = 0
+    rows: int = 1
+    layout: str = None
 
 class BeamformingSimulator(QMainWindow):
     def __init__(self):
@@ -27,9 +30,12 @@ class BeamformingSimulator(QMainWindow):
         self.update_plots()
 
     def _init_components(self):
-        self.visualization_panel = VisualizationPanel()
         self.visualization_controller = VisualizationController()
+        self.visualization_panel = VisualizationPanel(self.visualization_controller)
         self.parameter_panel = ParameterPanel()
+        # Frames arrive with a coarse interference map first and are refined once the sliders settle.
+        self.render_scheduler = RenderScheduler(self.visualization_controller.compute_preview, self,
+                                                refine=self.visualization_controller.refine_frame)
 
     def _setup_ui(self):
         main_widget = QWidget()
@@ -39,12 +45,15 @@ class BeamformingSimulator(QMainWindow):
         layout.addWidget(self.parameter_panel, stretch=1)
 
     def _connect_signals(self):
+        self.render_scheduler.frame_ready.connect(self._update_visualization)
         self.parameter_panel.array_type.currentTextChanged.connect(self._toggle_parameters)
+        self.parameter_panel.layout_loaded.connect(self.update_plots)
         self._connect_slider_signals()
 
     def _connect_slider_signals(self):
         sliders = [
             self.parameter_panel.elements,
+            self.parameter_panel.rows,
             self.parameter_panel.spacing,
             self.parameter_panel.steering,
             self.parameter_panel.curvature,
@@ -57,8 +66,11 @@ class BeamformingSimulator(QMainWindow):
 
     def _toggle_parameters(self, array_type):
         is_curved = array_type == "Curved"
+        is_custom = array_type == "Custom"
         self.parameter_panel.curvature.setEnabled(is_curved)
-        self.parameter_panel.spacing.setEnabled(not is_curved)
+        self.parameter_panel.spacing.setEnabled(not is_curved and not is_custom)
+        self.parameter_panel.elements.setEnabled(not is_custom)
+        self.parameter_panel.rows.setEnabled(array_type == "Planar")
         self.update_plots()
 
     def update_plots(self):
@@ -71,15 +83,15 @@ class BeamformingSimulator(QMainWindow):
             frequency=self.parameter_panel.frequency.value(),
             x_position=self.parameter_panel.x_position.value(),
             y_position=self.parameter_panel.y_position.value(),
-            phase=0
+            phase=0,
+            rows=self.parameter_panel.rows.value(),
+            layout=self.parameter_panel.layout_path
         )
         
-        self._update_visualization(params)
+        self.render_scheduler.request([vars(params)])
 
-    def _update_visualization(self, params):
-        self.visualization_panel.clear_all_plots()
-        self.visualization_panel.update_plots([vars(params)], self.visualization_controller)
-        self.visualization_panel.refresh_all_canvases()
+    def _update_visualization(self, params_list, frame):
+        self.visualization_panel.render_frame(frame)
 
     def _apply_styling(self):
         self.setStyleSheet("""
@@ -1,9 +1,16 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QGridLayout, QLabel, QComboBox, QPushButton, QHBoxLayout
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QGridLayout, QLabel, QComboBox, QPushButton, QHBoxLayout,
+                             QFileDialog, QMessageBox)
+from model.array_model import ArrayModel
+from model.presets import PRESETS
 from .parameter_slider import ParameterSlider, SliderConfig
 
 class ParameterPanel(QWidget):
+    layout_loaded = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.layout_path = None
         self._init_ui()
         
     def _init_ui(self):
@@ -11,6 +18,7 @@ class ParameterPanel(QWidget):
         self._setup_preset_buttons()
         self._setup_array_type()
         self._setup_sliders()
+        self._setup_layout_loader()
         self._apply_styling()
     
     def _setup_layout(self):
@@ -30,40 +38,7 @@ class ParameterPanel(QWidget):
         self.preset_buttons = {}
         
         # Create buttons for each preset
-        presets = {
-            '5G Communications': {
-                'elements': 64,
-                'spacing': 0.2,
-                'steering': 0.0,
-                'curvature': 0.0,
-                'frequency': 1000.0,
-                'x_position': 0.0,
-                'y_position': 0.0,
-                'array_type': 'Linear'
-            },
-            'Medical Ultrasound': {
-                'elements': 7,
-                'spacing': 10.0,
-                'steering': 0.0,
-                'curvature': 0.0,
-                'frequency': 10.0,
-                'x_position': 0.0,
-                'y_position': 0.0,
-                'array_type': 'Linear'
-            },
-            'Tumor Ablation': {
-                'elements': 98,
-                'spacing': 0.0,
-                'steering': 0.0,
-                'curvature': 2.1,
-                'frequency': 900.0,
-                'x_position': 0.0,
-                'y_position': 0.0,
-                'array_type': 'Linear'
-            }
-        }
-        
-        for name, config in presets.items():
+        for name, config in PRESETS.items():
             btn = QPushButton(name)
             btn.setProperty('config', config)
             btn.clicked.connect(lambda checked, c=config: self._apply_preset(c))
@@ -81,6 +56,7 @@ class ParameterPanel(QWidget):
         self.sliders['spacing'].setValue(config['spacing'])
         self.sliders['steering'].setValue(config['steering'])
         self.sliders['curvature'].setValue(config['curvature'])
+        self.sliders['rows'].setValue(config.get('rows', 1))
         self.sliders['frequency'].setValue(config['frequency'])
         self.sliders['x_position'].setValue(config['x_position'])
         self.sliders['y_position'].setValue(config['y_position'])
@@ -88,12 +64,13 @@ class ParameterPanel(QWidget):
     def _setup_array_type(self):
         self.grid_layout.addWidget(QLabel("Array Type:"), 0, 0)
         self.array_type = QComboBox()
-        self.array_type.addItems(["Linear", "Curved"])
+        self.array_type.addItems(["Linear", "Curved", "Planar"])
         self.grid_layout.addWidget(self.array_type, 0, 1)
     
     def _setup_sliders(self):
         slider_configs = {
             'elements': SliderConfig("Elements", 2, 100, 16, 1),
+            'rows': SliderConfig("Rows", 1, 100, 8, 1),
             'spacing': SliderConfig("Spacing (λ)", 0.1, 10.0, 0.5, 0.1),
             'steering': SliderConfig("Steering (°)", -90, 90, 0, 1),
             'curvature': SliderConfig("Curvature", 0.1, 5.0, 1.0, 0.1),
@@ -108,10 +85,31 @@ class ParameterPanel(QWidget):
             self.grid_layout.addWidget(self.sliders[name], i, 0, 1, 2)
         
         self.sliders['curvature'].setEnabled(False)
+        self.sliders['rows'].setEnabled(False)
         
         self.group.setLayout(self.grid_layout)
         self.layout.addWidget(self.group)
     
+    def _setup_layout_loader(self):
+        self.load_layout_button = QPushButton("Load Layout...")
+        self.load_layout_button.clicked.connect(self._load_layout)
+        self.grid_layout.addWidget(self.load_layout_button, len(self.sliders) + 1, 0, 1, 2)
+
+    def _load_layout(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Element Layout", "", "Element layouts (*.npy *.csv)")
+        if not path:
+            return
+        try:
+            ArrayModel.load_layout(path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Load Layout", f"Could not load {path}:\n{error}")
+            return
+        self.layout_path = path
+        if self.array_type.findText("Custom") < 0:
+            self.array_type.addItem("Custom")
+        self.array_type.setCurrentText("Custom")
+        self.layout_loaded.emit(path)
+
     def _apply_styling(self):
         self.setStyleSheet("""
             QGroupBox {
@@ -163,6 +161,8 @@ class ParameterPanel(QWidget):
     @property
     def elements(self): return self.sliders['elements']
     @property
+    def rows(self): return self.sliders['rows']
+    @property
     def spacing(self): return self.sliders['spacing']
     @property
     def steering(self): return self.sliders['steering']
@@ -0,0 +1,117 @@
+import sys
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from model.cancellation import ComputationCancelled
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, object, object, object)
+
+
+class _ComputeJob(QRunnable):
+    def __init__(self, compute, generation, params_list, refinement=False):
+        super().__init__()
+        self.signals = _JobSignals()
+        self.refinement = refinement
+        self._compute = compute
+        self._generation = generation
+        self._params_list = params_list
+
+    def run(self):
+        try:
+            frame = self._compute(self._params_list)
+        except Exception as error:
+            self.signals.finished.emit(self._generation, self._params_list, None, error)
+            return
+        self.signals.finished.emit(self._generation, self._params_list, frame, None)
+
+
+class RenderScheduler(QObject):
+    frame_ready = pyqtSignal(object, object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, compute, parent=None, refine=None, settle_ms=150):
+        super().__init__(parent)
+        self._compute = compute
+        self._refine = refine
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._generation = 0
+        self._pending = None
+        self._running = None
+        self._cancel_refinement = None
+        self._setup_timer()
+        self._setup_refine_timer(settle_ms)
+        self.failed.connect(self._report_failure)
+
+    def _setup_timer(self):
+        # A zero-interval single-shot timer fires once the current burst of
+        # valueChanged signals has been processed, so a burst becomes one job.
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._dispatch)
+
+    def _setup_refine_timer(self, settle_ms):
+        # Refinement starts only after the parameters have been still for settle_ms.
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(settle_ms)
+        self._refine_timer.timeout.connect(self._dispatch_refinement)
+        self._refine_frame = None
+
+    def request(self, params_list):
+        self._generation += 1
+        self._pending = (self._generation, params_list)
+        self._refine_timer.stop()
+        if self._cancel_refinement is not None:
+            self._cancel_refinement.set()
+        self._timer.start()
+
+    def is_busy(self):
+        return self._running is not None or self._pending is not None or self._refine_timer.isActive()
+
+    def wait_for_done(self, timeout_ms=-1):
+        self._pool.waitForDone(timeout_ms)
+
+    def _dispatch(self):
+        if self._running is not None or self._pending is None:
+            return
+        generation, params_list = self._pending
+        self._pending = None
+        self._start(_ComputeJob(self._compute, generation, params_list))
+
+    def _dispatch_refinement(self):
+        frame, self._refine_frame = self._refine_frame, None
+        if frame is None or self._running is not None or self._pending is not None:
+            return
+        # A newer request sets the event and the model stops at its next tile.
+        cancel = threading.Event()
+        self._cancel_refinement = cancel
+        refine = lambda params_list: self._refine(frame, cancel.is_set)
+        self._start(_ComputeJob(refine, self._generation, frame.params_list, refinement=True))
+
+    def _start(self, job):
+        job.signals.finished.connect(self._on_finished)
+        self._running = job
+        self._pool.start(job)
+
+    def _on_finished(self, generation, params_list, frame, error):
+        refinement = self._running is not None and self._running.refinement
+        self._running = None
+        self._cancel_refinement = None
+        if isinstance(error, ComputationCancelled):
+            pass
+        elif error is not None:
+            self.failed.emit(error)
+        elif generation == self._generation and frame is not None:
+            # Results superseded by a newer request are dropped; the newer job runs next.
+            # A refined frame is already at full resolution, so only previews schedule a refinement.
+            self.frame_ready.emit(params_list, frame)
+            if self._refine is not None and self._pending is None and not refinement:
+                self._refine_frame = frame
+                self._refine_timer.start()
+        self._dispatch()
+
+    def _report_failure(self, error):
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
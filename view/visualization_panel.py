@@ -1,10 +1,12 @@
 from dataclasses import dataclass
-from PyQt5.QtWidgets import QWidget, QGridLayout
+import os
+from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-from controller.beam_pattern_controller import BeamPatternController
-from controller.array_geometry_controller import ArrayGeometryController
-from controller.interference_controller import InterferenceController
+from matplotlib.figure import Figure
+from controller.visualization_controller import VisualizationController
+from model.profiling import profiler
+from .blit_manager import BlitManager
+from .interference_heatmap import InterferenceHeatmap
 @dataclass
 class PlotConfig:
     title: str
@@ -14,13 +16,20 @@ class PlotConfig:
     is_polar: bool = False
 
 class VisualizationPanel(QWidget):
-    def __init__(self):
+    def __init__(self, controller=None, interference_backend=None):
         super().__init__()
-        self.beam_controller = BeamPatternController()
-        self.array_geometry_controller = ArrayGeometryController()
-        self.interference_controller = InterferenceController()
+        self.controller = controller or VisualizationController()
+        self.beam_controller = self.controller.beam_visualizer
+        self.array_geometry_controller = self.controller.array_visualizer
+        self.interference_controller = self.controller.interference_visualizer
+        self.render_mode = 'incremental'
+        # 'qimage' draws the interference map straight from NumPy instead of through matplotlib.
+        self.interference_backend = (interference_backend or
+                                     os.environ.get('BEAMFORMING_INTERFERENCE_BACKEND', 'matplotlib'))
+        self.heatmap = None
         self._init_layout()
         self._setup_plots()
+        self._setup_frame_overlay()
 
     def _init_layout(self):
         self.layout = QGridLayout(self)
@@ -61,13 +70,23 @@ class VisualizationPanel(QWidget):
         self.figures = {}
         self.canvases = {}
         self.axes = {}
+        self.blit_managers = {}
         
         for name, config in plot_configs.items():
-            self._create_plot(name, config)
+            if name == 'interference' and self.interference_backend == 'qimage':
+                self._create_heatmap(config)
+            else:
+                self._create_plot(name, config)
+
+    def _create_heatmap(self, config):
+        self.heatmap = InterferenceHeatmap(self.interference_controller)
+        self.layout.addWidget(self.heatmap, *config.position)
 
     def _create_plot(self, name, config):
-        self.figures[name] = plt.figure(figsize=config.figsize, facecolor='#111827')
+        # Figures are embedded in Qt canvases directly; pyplot's figure managers are never needed.
+        self.figures[name] = Figure(figsize=config.figsize, facecolor='#111827')
         self.canvases[name] = FigureCanvas(self.figures[name])
+        self.blit_managers[name] = BlitManager(self.canvases[name], name)
         
         projection = 'polar' if config.is_polar else None
         self.axes[name] = self.figures[name].add_subplot(111, projection=projection)
@@ -83,16 +102,70 @@ class VisualizationPanel(QWidget):
         ax.yaxis.label.set_color('white')
         ax.title.set_color('white')
 
+    def _setup_frame_overlay(self):
+        self.frame_overlay = QLabel(self)
+        self.frame_overlay.setStyleSheet(
+            "color: #A7F3D0; background-color: rgba(17, 24, 39, 200); font: 9pt monospace; padding: 2px;"
+        )
+        self.frame_overlay.move(4, 4)
+        self.set_frame_overlay(profiler.enabled)
+
+    def set_frame_overlay(self, visible):
+        self.frame_overlay.setVisible(visible)
+        if visible:
+            self.frame_overlay.raise_()
+
+    def _update_frame_overlay(self):
+        if not self.frame_overlay.isVisible():
+            return
+        percentiles = profiler.percentiles('frame.render', (50, 95))
+        compute = profiler.percentiles('frame.compute', (50,))
+        self.frame_overlay.setText(
+            f"render p50 {percentiles[50] * 1e3:5.1f} ms  p95 {percentiles[95] * 1e3:5.1f} ms  "
+            f"compute p50 {compute[50] * 1e3:5.1f} ms  {profiler.fps():5.1f} FPS"
+        )
+        self.frame_overlay.adjustSize()
+
     def update_plots(self, params_list, controller):
-        self.beam_controller.plot_rectangular_beam(self.axes['beam'], params_list)
-        self.interference_controller.plot_interference(self.axes['interference'], params_list)
-        self.beam_controller.plot_polar_beam(self.axes['polar'], params_list)
-        self.array_geometry_controller.plot_array_geometry(self.axes['array'], params_list)
+        self.render_frame(controller.compute_frame(params_list))
+
+    def render_frame(self, frame):
+        with profiler.stage('frame.render'):
+            self._render_frame(frame)
+        profiler.mark_frame()
+        self._update_frame_overlay()
+
+    def _render_frame(self, frame):
+        params_list = frame.params_list
+        if self.heatmap is not None:
+            self.heatmap.set_pattern(frame.interference)
+        if self.render_mode == 'incremental':
+            self._render_incremental(params_list, frame)
+            return
+        self.beam_controller.plot_rectangular_beam(self.axes['beam'], params_list, frame.beam)
+        if self.heatmap is None:
+            self.interference_controller.plot_interference(self.axes['interference'], params_list, frame.interference)
+        self.beam_controller.plot_polar_beam(self.axes['polar'], params_list, frame.beam)
+        self.array_geometry_controller.plot_array_geometry(self.axes['array'], params_list, frame.geometry)
         self.refresh_all_canvases()
 
+    def _render_incremental(self, params_list, frame):
+        redraw = {
+            'beam': self.beam_controller.update_rectangular_beam(self.axes['beam'], params_list, frame.beam),
+            'polar': self.beam_controller.update_polar_beam(self.axes['polar'], params_list, frame.beam),
+            'array': self.array_geometry_controller.update_array_geometry(
+                self.axes['array'], params_list, frame.geometry)
+        }
+        if self.heatmap is None:
+            redraw['interference'] = self.interference_controller.update_interference(
+                self.axes['interference'], params_list, frame.interference)
+        for name, redraw_background in redraw.items():
+            self.blit_managers[name].update(redraw_background)
+
     def refresh_all_canvases(self):
-        for canvas in self.canvases.values():
-            canvas.draw()
+        for name, canvas in self.canvases.items():
+            with profiler.stage(f'render.draw.{name}'):
+                canvas.draw()
 
     def clear_all_plots(self):
         for name, ax in self.axes.items():